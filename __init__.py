@@ -4,94 +4,370 @@
 # Licensed under the GNU General Public License v3.0 or later
 # See the LICENSE file in the top-level directory for details.
 
+import contextlib
+import os
+import time
+
 import bpy
 import importlib
 
 from .descriptions import props
-from . import steps
+from . import cli, steps
 
 importlib.reload(descriptions)
+importlib.reload(cli)
 importlib.reload(steps)
 
+duplicate_modes = [
+    ('DATA', "Data API", ""),
+    ('OPERATOR', "Operator", ""),
+]
+
+merge_modes = [
+    ('DIRECT', "Direct", ""),
+    ('JOIN', "Join", ""),
+]
+
+modifier_modes = [
+    ('EVALUATE', "Evaluate", ""),
+    ('OPERATOR', "Operator", ""),
+]
+
+bake_methods = [
+    ('CYCLES', "Cycles", ""),
+    ('ATLAS', "Atlas", ""),
+]
+
+resolution_modes = [
+    ('1', "Full", ""),
+    ('2', "1/2", ""),
+    ('4', "1/4", ""),
+    ('8', "1/8", ""),
+    ('ABSOLUTE', "Absolute", ""),
+]
+
+packing_sources = [
+    ('NONE', "None", ""),
+    ('AO', "Ambient Occlusion", ""),
+    ('ROUGH', "Roughness", ""),
+    ('MASK', "Material Index", ""),
+]
+
+channel_labels = [
+    ("albedo", "Albedo"),
+    ("normal", "Normal"),
+    ("rough", "Roughness"),
+    ("mask", "Material Index"),
+    ("emission", "Emission"),
+    ("ao", "Ambient Occlusion"),
+]
+
+margin_types = [
+    ('ADJACENT_FACES', "Adjacent Faces", ""),
+    ('EXTEND', "Extend", ""),
+]
+
+compression_modes = [
+    ('NONE', "None", ""),
+    ('DRACO', "Draco", ""),
+    ('QUANTIZE', "Quantize", ""),
+]
+
+image_formats = [
+    ('AUTO', "Automatic", ""),
+    ('WEBP', "WebP", ""),
+    ('JPEG', "JPEG", ""),
+    ('NONE', "None", ""),
+]
+
 
 class COLLECTION_OT_MergeExportBake(bpy.types.Operator):
     bl_idname = "collection.merge_export_bake"
     bl_label = "Merge Export Bake"
     prefix: bpy.props.StringProperty(default="bake")
     size: bpy.props.IntProperty(default=2048)
+    batch: bpy.props.StringProperty(default="")
 
     def execute(self, context):
+        if self.batch != "":
+            return self.execute_batch(context)
+
         prefix = self.prefix
-        texture_toggles = bpy.context.scene.merge_exporter_settings.texture_toggles
+        settings = bpy.context.scene.merge_exporter_settings
+        texture_toggles = settings.texture_toggles
+        plan = self.plan(texture_toggles)
+        key = None
+
+        images = [(channel, self.get(prefix + "." + channel,
+                                     steps.textures.channel_size(texture_toggles, channel, self.size)))
+                  for channel, bake_type in plan]
+
+        if settings.bake_cache:
+            key = steps.bake_cache.compute_key(
+                context, context.selected_objects, [channel for channel, image in images],
+                [image.size[0] for channel, image in images])
+
+            if steps.bake_cache.load(key, images):
+                self.report({'INFO'}, "Bake cache hit for " + prefix)
+                return {'FINISHED'}
+
+        objects = list(context.selected_objects)
+        targets = self.resolve_targets(objects)
+        timings = []
+
+        with self.isolate(context, objects) as scratch:
+            if scratch != None:
+                scratch.select(None, objects)
+
+            for i, (channel, bake_type) in enumerate(plan):
+                image = images[i][1]
+                start = time.perf_counter()
+                saved = self.apply_profile(context, channel)
+                occluders = self.add_occluders(context, scratch, channel)
+
+                try:
+                    if channel == "mask":
+                        self.bake_mask(context, image)
+                    else:
+                        self.swap_to(targets, image)
+                        bpy.ops.object.bake(type=bake_type)
+                finally:
+                    self.restore_profile(context, saved)
+
+                    if len(occluders) > 0:
+                        scratch.unlink(occluders)
+
+                timings.append("%s %.2f s" %
+                               (channel, time.perf_counter() - start))
+
+        if len(timings) > 0:
+            self.report({'INFO'}, "Baked " + prefix + ": " + ", ".join(timings))
+
+        if key != None:
+            steps.bake_cache.store(key, images, settings.bake_cache_size * 1024 * 1024)
+
+        return {'FINISHED'}
+
+    def execute_batch(self, context):
+        # Collections are separated by new lines. Their materials must not be shared,
+        # since every material can only point at one target image per bake.
+        settings = context.scene.merge_exporter_settings
+        plan = self.plan(settings.texture_toggles)
+        channels = [channel for channel, bake_type in plan]
+        groups = []
+
+        for name in self.batch.split("\n"):
+            collection = bpy.data.collections[name]
+            meshes = [obj for obj in collection.objects if obj.type == "MESH"]
+            size = collection.merge_exporter_props.texture_size
+
+            images = [(channel, self.get(name + "." + channel, steps.textures.channel_size(
+                settings.texture_toggles, channel, size))) for channel in channels]
+            key = None
+
+            if settings.bake_cache:
+                key = steps.bake_cache.compute_key(
+                    context, meshes, channels, [image.size[0] for channel, image in images])
+
+                if steps.bake_cache.load(key, images):
+                    self.report({'INFO'}, "Bake cache hit for " + name)
+                    continue
+
+            groups.append((name, meshes, images, key,
+                          self.resolve_targets(meshes)))
+
+        if len(groups) == 0:
+            return {'FINISHED'}
+
+        objects = [obj for group in groups for obj in group[1]]
+        timings = []
+
+        with self.isolate(context, objects) as scratch:
+            if scratch != None:
+                scratch.select(None, objects)
+
+            for i, (channel, bake_type) in enumerate(plan):
+                start = time.perf_counter()
+                saved = self.apply_profile(context, channel)
+                occluders = self.add_occluders(context, scratch, channel)
+
+                try:
+                    if channel == "mask":
+                        for name, meshes, images, key, targets in groups:
+                            self.rasterize_mask(context, images[i][1], meshes)
+                    else:
+                        for name, meshes, images, key, targets in groups:
+                            self.swap_to(targets, images[i][1])
+
+                        bpy.ops.object.bake(type=bake_type)
+                finally:
+                    self.restore_profile(context, saved)
+
+                    if len(occluders) > 0:
+                        scratch.unlink(occluders)
+
+                timings.append("%s %.2f s" %
+                               (channel, time.perf_counter() - start))
+
+        self.report({'INFO'}, "Baked %d collections: %s" %
+                    (len(groups), ", ".join(timings)))
+
+        for name, meshes, images, key, targets in groups:
+            if key != None:
+                steps.bake_cache.store(
+                    key, images, settings.bake_cache_size * 1024 * 1024)
+
+        return {'FINISHED'}
+
+    def plan(self, texture_toggles):
+        # The mask swaps every material slot to the masker, so it goes last
+        # and the original materials are only reassigned once.
+        plan = []
 
         if texture_toggles.albedo_toggle:
-            self.swap_to(context, self.get(prefix + ".albedo"))
-            bpy.ops.object.bake(type="DIFFUSE")
+            plan.append(("albedo", "DIFFUSE"))
 
         if texture_toggles.normal_toggle:
-            self.swap_to(context, self.get(prefix + ".normal"))
-            bpy.ops.object.bake(type="NORMAL")
-
-        if texture_toggles.rough_toggle:
-            self.swap_to(context, self.get(prefix + ".rough"))
-            bpy.ops.object.bake(type="ROUGHNESS")
+            plan.append(("normal", "NORMAL"))
 
         if texture_toggles.rough_toggle:
-            self.bake_mask(context, self.get(prefix + ".mask"))
+            plan.append(("rough", "ROUGHNESS"))
 
         if texture_toggles.emission_toggle:
-            self.swap_to(context, self.get(prefix + ".emission"))
-            bpy.ops.object.bake(type="EMIT")
+            plan.append(("emission", "EMIT"))
 
         if texture_toggles.ao_toggle:
-            self.swap_to(context, self.get(prefix + ".ao"))
-            bpy.ops.object.bake(type="AO")
+            plan.append(("ao", "AO"))
 
-        return {'FINISHED'}
+        if texture_toggles.mask_toggle:
+            plan.append(("mask", "DIFFUSE"))
 
-    def swap_to(self, context, image):
-        for obj in context.selected_objects:
-            if obj.type != "MESH":
-                continue
+        return plan
+
+    def isolate(self, context, objects):
+        if not context.scene.merge_exporter_settings.isolated_bake:
+            return contextlib.nullcontext()
+
+        visible = [obj for obj in context.scene.objects
+                   if obj.visible_get() and not obj.hide_render]
+        before = steps.profiling.count_geometry(visible)
+        after = steps.profiling.count_geometry(
+            objects + self.occluders(context))
+
+        self.report({'INFO'}, "Bake scene sync: %d objects, %d triangles instead of %d objects, %d triangles" % (
+            after["objects"], after["triangles"], before["objects"], before["triangles"]))
+
+        return steps.ScratchSceneStep(context, objects)
+
+    def occluders(self, context):
+        collection = context.scene.merge_exporter_settings.ao_occluders
 
-            if not obj.material_slots:
+        if collection == None:
+            return []
+
+        return [obj for obj in collection.all_objects if obj.type == "MESH"]
+
+    def add_occluders(self, context, scratch, channel):
+        if scratch == None or channel != "ao":
+            return []
+
+        return scratch.link(self.occluders(context))
+
+    def apply_profile(self, context, channel):
+        settings = context.scene.merge_exporter_settings
+
+        if not settings.use_bake_profiles:
+            return None
+
+        profile = getattr(settings.bake_profiles, channel)
+        bake = context.scene.render.bake
+        cycles = context.scene.cycles
+        saved = (cycles.samples, cycles.use_denoising, cycles.tile_size, cycles.use_auto_tile,
+                 bake.margin, bake.margin_type, bake.use_pass_direct, bake.use_pass_indirect, bake.use_pass_color)
+
+        cycles.samples = profile.samples
+        cycles.use_denoising = profile.use_denoising
+        cycles.tile_size = profile.tile_size
+        cycles.use_auto_tile = True
+        bake.margin = profile.margin
+        bake.margin_type = profile.margin_type
+
+        # Albedo and the mask only need the color, not the lighting.
+        if channel != "ao":
+            bake.use_pass_direct = False
+            bake.use_pass_indirect = False
+            bake.use_pass_color = True
+
+        return saved
+
+    def restore_profile(self, context, saved):
+        if saved == None:
+            return
+
+        bake = context.scene.render.bake
+        cycles = context.scene.cycles
+
+        (cycles.samples, cycles.use_denoising, cycles.tile_size, cycles.use_auto_tile,
+         bake.margin, bake.margin_type, bake.use_pass_direct, bake.use_pass_indirect, bake.use_pass_color) = saved
+
+    def resolve_targets(self, objects):
+        targets = {}
+
+        for obj in objects:
+            if obj.type != "MESH":
                 continue
 
             for slot in obj.material_slots:
                 material = slot.material
 
-                if not material.use_nodes:
+                if material == None or material in targets:
                     continue
 
-                nodes = material.node_tree.nodes
+                targets[material] = self.find_target(material)
 
-                for node in nodes:
-                    node.select = False
+        return {material: node for material, node in targets.items() if node != None}
 
-                tex_nodes = [
-                    node for node in nodes if node.type == 'TEX_IMAGE']
+    def find_target(self, material):
+        if not material.use_nodes:
+            return None
 
-                if len(tex_nodes) == 0:
-                    continue
+        nodes = material.node_tree.nodes
+        target = None
+
+        for node in nodes:
+            node.select = False
+
+            if target != None or node.type != 'TEX_IMAGE':
+                continue
 
-                for node in tex_nodes:
-                    if node.outputs[0].is_linked or node.outputs[1].is_linked:
-                        continue
+            if node.outputs[0].is_linked or node.outputs[1].is_linked:
+                continue
+
+            target = node
+
+        if target != None:
+            target.select = True
+            nodes.active = target
 
-                    node.image = image
-                    node.select = True
-                    material.node_tree.nodes.active = node
+        return target
 
-                    break
+    def swap_to(self, targets, image):
+        for node in targets.values():
+            node.image = image
 
     def prepare_masker(self, context):
-        if not "masker" in bpy.data.materials:
+        divisor = context.scene.merge_exporter_settings.material_count - 1
+        masker = bpy.data.materials.get("masker")
+
+        if masker != None and masker.get("divisor") == divisor:
+            return masker
+
+        if masker == None:
             masker = bpy.data.materials.new(name="masker")
             masker.use_nodes = True
 
-        masker = bpy.data.materials["masker"]
+        masker["divisor"] = divisor
         node_tree = masker.node_tree
-        divisor = context.scene.merge_exporter_settings.material_count - 1
 
         for node in node_tree.nodes:
             node_tree.nodes.remove(node)
@@ -137,27 +413,49 @@ class COLLECTION_OT_MergeExportBake(bpy.types.Operator):
         return masker
 
     def bake_mask(self, context, mask):
+        if context.scene.merge_exporter_settings.mask_rasterize:
+            self.rasterize_mask(context, mask, context.selected_objects)
+            return
+
         saved_materials = {}
         masker = self.prepare_masker(context)
+        meshes = [obj for obj in context.selected_objects if obj.type == "MESH"]
 
-        for obj in context.selected_objects:
+        for obj in meshes:
             saved_materials[obj.name] = list(obj.data.materials)
 
-        for obj in context.selected_objects:
+        for obj in meshes:
             for i in range(0, len(obj.data.materials)):
                 obj.data.materials[i] = masker
 
-            self.swap_to(context, mask)
+        self.swap_to({masker: self.find_target(masker)}, mask)
 
         bpy.ops.object.bake(type="DIFFUSE")
 
-        for obj in context.selected_objects:
+        for obj in meshes:
             mats = saved_materials[obj.name]
 
             for i in range(0, len(obj.data.materials)):
                 obj.data.materials[i] = mats[i]
 
-    def get(self, name):
+    def rasterize_mask(self, context, mask, objects):
+        depsgraph = context.evaluated_depsgraph_get()
+        evaluated = [obj.evaluated_get(depsgraph)
+                     for obj in objects if obj.type == "MESH"]
+
+        try:
+            pixels = steps.rasterize.material_mask(
+                [obj.to_mesh() for obj in evaluated], mask.size[0],
+                context.scene.merge_exporter_settings.material_count - 1,
+                context.scene.render.bake.margin)
+        finally:
+            for obj in evaluated:
+                obj.to_mesh_clear()
+
+        steps.textures.write_pixels(mask, pixels)
+        mask.update()
+
+    def get(self, name, size):
         images = bpy.data.images
         check = images.get(name)
 
@@ -165,11 +463,11 @@ class COLLECTION_OT_MergeExportBake(bpy.types.Operator):
             bpy.data.images.remove(check)
             check = None
 
-        if check != None and check.size[0] != self.size:
-            check.scale(self.size, self.size)
+        if check != None and check.size[0] != size:
+            check.scale(size, size)
 
         if not any(image.name == name for image in images):
-            bpy.ops.image.new(name=name, width=self.size, height=self.size)
+            bpy.ops.image.new(name=name, width=size, height=size)
             image = images.get(name)
 
             if "normal" in name or "rough" in name or "mask" in name:
@@ -185,9 +483,184 @@ class FILE_OT_MergeExport(bpy.types.Operator):
     bl_idname = "file.merge_export"
     bl_label = "Merge Export"
 
+    timings = {}
+
+    def execute(self, context):
+        skipped = []
+        memory_peaks = {}
+        export_sizes = {}
+        missing_profiles = []
+        profile_totals = {}
+        timings = {}
+        parallel = context.scene.merge_exporter_settings.parallel_export
+
+        if parallel and bpy.data.filepath == "":
+            self.report(
+                {'WARNING'}, "Parallel export needs a saved file to resolve relative paths, exporting serially")
+            parallel = False
+
+        if parallel:
+            for result in self.export_parallel(context):
+                skipped.extend(result["skipped"])
+                memory_peaks.update(result["memory_peaks"])
+                export_sizes.update(result["export_sizes"])
+                missing_profiles.extend(result["missing_profiles"])
+                cli.add_totals(profile_totals, result["profile_totals"])
+
+                for name, seconds in result["timings"].items():
+                    timings[name] = timings.get(name, 0.00) + seconds
+        else:
+            texture_writer = steps.textures.create_writer(
+                context.scene.merge_exporter_settings)
+
+            try:
+                for collection in context.scene.collection.children:
+                    step_shared = steps.StepShared()
+                    step_shared.texture_writer = texture_writer
+                    steps.execute(context, collection, step_shared)
+                    skipped.extend(step_shared.skipped)
+                    memory_peaks.update(step_shared.memory_peaks)
+                    export_sizes.update(step_shared.export_sizes)
+                    missing_profiles.extend(step_shared.missing_profiles)
+
+                    if step_shared.profiler != None:
+                        cli.add_totals(profile_totals,
+                                       step_shared.profiler.totals)
+
+                    for name, seconds in step_shared.timings.items():
+                        timings[name] = timings.get(name, 0.00) + seconds
+            finally:
+                texture_writer.close()
+
+        FILE_OT_MergeExport.timings.update(timings)
+
+        if len(skipped) > 0:
+            self.report({'INFO'}, "Unchanged, skipped: " + ", ".join(skipped))
+
+        for name, profile in missing_profiles:
+            self.report({'WARNING'}, "Export profile \"%s\" of %s not found, used the %s" % (
+                profile, name, "active profile" if context.scene.merge_exporter_settings.use_active_profile else "default options"))
+
+        if context.scene.merge_exporter_settings.profile_summary:
+            self.report_profile(profile_totals)
+
+        for name, sizes in export_sizes.items():
+            self.report({'INFO'}, "Export size of " + name + ": " + ", ".join(
+                "%s %.2f MiB%s" % (profile, size / (1024 * 1024), " (used)" if used else "")
+                for profile, size, used in sizes))
+
+        if len(memory_peaks) > 0:
+            self.report({'INFO'}, "Peak texture memory: " + ", ".join(
+                "%s %.1f MiB" % (name, size / (1024 * 1024)) for name, size in memory_peaks.items()))
+
+        self.report_timings("Duplication", "duplicate.", duplicate_modes)
+        self.report_timings("Modifiers", "modifiers.", modifier_modes)
+        self.report_timings("Merging", "merge.", merge_modes)
+        self.report_timings("Baking", "bake.", bake_methods + [('PACK', "Packing", "")])
+
+        return {'FINISHED'}
+
+    def export_parallel(self, context):
+        settings = context.scene.merge_exporter_settings
+        roots = [collection.name for collection in context.scene.collection.children
+                 if collection.merge_exporter_props.active]
+
+        if len(roots) == 0:
+            return []
+
+        # Saved next to the original file so that relative export paths resolve the same way.
+        path = os.path.join(os.path.dirname(bpy.data.filepath),
+                            ".merge_export.%d.blend" % os.getpid())
+        bpy.ops.wm.save_as_mainfile(
+            filepath=path, copy=True, check_existing=False)
+
+        window_manager = context.window_manager
+        finished = []
+
+        def progress(result):
+            finished.append(result)
+            window_manager.progress_update(len(finished))
+            cli.print_progress(result)
+
+        window_manager.progress_begin(0, len(roots))
+        start = time.perf_counter()
+
+        try:
+            results = cli.run_pool([(path, [root]) for root in roots],
+                                   settings.parallel_workers, callback=progress)
+        finally:
+            window_manager.progress_end()
+            os.remove(path)
+
+        seconds = time.perf_counter() - start
+        failed = 0
+
+        for root, result in zip(roots, results):
+            if result["status"] == 0:
+                continue
+
+            print(result["log"])
+            failed += 1
+            lines = result["log"].strip().splitlines()
+            self.report({'ERROR'}, "Export of %s failed with exit code %d: %s" %
+                        (root, result["status"], lines[-1] if len(lines) > 0 else ""))
+
+        self.report({'INFO'}, "Exported %d of %d roots with %d workers in %.1f s" %
+                    (len(roots) - failed, len(roots), min(settings.parallel_workers, len(roots)), seconds))
+
+        return results
+
+    def report_profile(self, totals):
+        ordered = sorted(totals.items(), key=lambda item: -
+                         (item[1]["enter"] + item[1]["exit"]))
+
+        for name, total in ordered:
+            self.report({'INFO'}, "%-24s enter %8.3f s  exit %8.3f s" %
+                        (name, total["enter"], total["exit"]))
+
+    def report_timings(self, label, prefix, modes):
+        parts = []
+
+        for mode in modes:
+            seconds = self.timings.get(prefix + mode[0])
+
+            if seconds == None:
+                continue
+
+            parts.append("%s %.3f s" % (mode[1], seconds))
+
+        # Each mode keeps the timing of the last export that used it, modes from
+        # different runs are not measured on the same objects.
+        if len(parts) > 0:
+            self.report({'INFO'}, label + " (last run of each mode): " + ", ".join(parts))
+
+
+class SCENE_OT_MergeExportProfileAdd(bpy.types.Operator):
+    bl_idname = "scene.merge_export_profile_add"
+    bl_label = "Add Export Profile"
+
     def execute(self, context):
-        for collection in context.scene.collection.children:
-            steps.execute(context, collection)
+        settings = context.scene.merge_exporter_settings
+        profile = settings.export_profiles.add()
+        profile.name = "Profile %d" % len(settings.export_profiles)
+        settings.export_profile_index = len(settings.export_profiles) - 1
+
+        return {'FINISHED'}
+
+
+class SCENE_OT_MergeExportProfileRemove(bpy.types.Operator):
+    bl_idname = "scene.merge_export_profile_remove"
+    bl_label = "Remove Export Profile"
+
+    def execute(self, context):
+        settings = context.scene.merge_exporter_settings
+
+        if settings.export_profile_index >= len(settings.export_profiles):
+            return {'CANCELLED'}
+
+        settings.export_profiles.remove(settings.export_profile_index)
+        settings.export_profile_index = max(
+            0, min(settings.export_profile_index, len(settings.export_profiles) - 1))
 
         return {'FINISHED'}
 
@@ -215,9 +688,17 @@ class MergeExporter_CollectionProps(bpy.types.PropertyGroup):
     export_origin: bpy.props.BoolProperty(
         name="Export Origin", default=True, description=props["collection.export_origin"])
     texture_size: bpy.props.IntProperty(name="Texture Size", default=2048)
+    bake_method: bpy.props.EnumProperty(
+        name="Bake Method",
+        items=bake_methods,
+        default='CYCLES',
+        description=props["collection.bake_method"],
+    )
     override_name: bpy.props.BoolProperty(
         name="Override Name", default=False, description=props["collection.override_name"])
     name: bpy.props.StringProperty(name="Name", default="merged")
+    export_profile: bpy.props.StringProperty(
+        name="Export Profile", description=props["collection.export_profile"])
 
 
 class MergeExporter_TextureToggles(bpy.types.PropertyGroup):
@@ -245,6 +726,157 @@ class MergeExporter_TextureToggles(bpy.types.PropertyGroup):
         name="Ambient Occlusion",
         default=False,
     )
+    albedo_resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=resolution_modes,
+        default='1',
+        description=props["texture_toggles.resolution"],
+    )
+    albedo_size: bpy.props.IntProperty(
+        name="Size", default=512, min=1, subtype='PIXEL', description=props["texture_toggles.size"])
+    normal_resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=resolution_modes,
+        default='1',
+        description=props["texture_toggles.resolution"],
+    )
+    normal_size: bpy.props.IntProperty(
+        name="Size", default=512, min=1, subtype='PIXEL', description=props["texture_toggles.size"])
+    rough_resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=resolution_modes,
+        default='1',
+        description=props["texture_toggles.resolution"],
+    )
+    rough_size: bpy.props.IntProperty(
+        name="Size", default=512, min=1, subtype='PIXEL', description=props["texture_toggles.size"])
+    mask_resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=resolution_modes,
+        default='1',
+        description=props["texture_toggles.resolution"],
+    )
+    mask_size: bpy.props.IntProperty(
+        name="Size", default=512, min=1, subtype='PIXEL', description=props["texture_toggles.size"])
+    emission_resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=resolution_modes,
+        default='1',
+        description=props["texture_toggles.resolution"],
+    )
+    emission_size: bpy.props.IntProperty(
+        name="Size", default=512, min=1, subtype='PIXEL', description=props["texture_toggles.size"])
+    ao_resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=resolution_modes,
+        default='1',
+        description=props["texture_toggles.resolution"],
+    )
+    ao_size: bpy.props.IntProperty(
+        name="Size", default=512, min=1, subtype='PIXEL', description=props["texture_toggles.size"])
+
+
+class MergeExporter_BakeProfile(bpy.types.PropertyGroup):
+    samples: bpy.props.IntProperty(
+        name="Samples", default=1, min=1, description=props["bake_profile.samples"])
+    margin: bpy.props.IntProperty(
+        name="Margin", default=16, min=0, subtype='PIXEL', description=props["bake_profile.margin"])
+    margin_type: bpy.props.EnumProperty(
+        name="Margin Type", items=margin_types, default='ADJACENT_FACES')
+    use_denoising: bpy.props.BoolProperty(
+        name="Denoise", default=False, description=props["bake_profile.use_denoising"])
+    tile_size: bpy.props.IntProperty(
+        name="Tile Size", default=2048, min=8, subtype='PIXEL', description=props["bake_profile.tile_size"])
+
+
+class MergeExporter_AOBakeProfile(bpy.types.PropertyGroup):
+    samples: bpy.props.IntProperty(
+        name="Samples", default=64, min=1, description=props["bake_profile.samples"])
+    margin: bpy.props.IntProperty(
+        name="Margin", default=16, min=0, subtype='PIXEL', description=props["bake_profile.margin"])
+    margin_type: bpy.props.EnumProperty(
+        name="Margin Type", items=margin_types, default='ADJACENT_FACES')
+    use_denoising: bpy.props.BoolProperty(
+        name="Denoise", default=True, description=props["bake_profile.use_denoising"])
+    tile_size: bpy.props.IntProperty(
+        name="Tile Size", default=2048, min=8, subtype='PIXEL', description=props["bake_profile.tile_size"])
+
+
+class MergeExporter_BakeProfiles(bpy.types.PropertyGroup):
+    albedo: bpy.props.PointerProperty(type=MergeExporter_BakeProfile)
+    normal: bpy.props.PointerProperty(type=MergeExporter_BakeProfile)
+    rough: bpy.props.PointerProperty(type=MergeExporter_BakeProfile)
+    mask: bpy.props.PointerProperty(type=MergeExporter_BakeProfile)
+    emission: bpy.props.PointerProperty(type=MergeExporter_BakeProfile)
+    ao: bpy.props.PointerProperty(type=MergeExporter_AOBakeProfile)
+
+
+class MergeExporter_ChannelPacking(bpy.types.PropertyGroup):
+    red: bpy.props.EnumProperty(
+        name="Red",
+        items=packing_sources,
+        default='AO',
+        description=props["channel_packing.component"],
+    )
+    green: bpy.props.EnumProperty(
+        name="Green",
+        items=packing_sources,
+        default='ROUGH',
+        description=props["channel_packing.component"],
+    )
+    blue: bpy.props.EnumProperty(
+        name="Blue",
+        items=packing_sources,
+        default='MASK',
+        description=props["channel_packing.component"],
+    )
+    alpha: bpy.props.EnumProperty(
+        name="Alpha",
+        items=packing_sources,
+        default='NONE',
+        description=props["channel_packing.component"],
+    )
+
+
+class MergeExporter_ExportProfile(bpy.types.PropertyGroup):
+    name: bpy.props.StringProperty(name="Name", default="Profile")
+    compression: bpy.props.EnumProperty(
+        name="Compression",
+        items=compression_modes,
+        default='NONE',
+        description=props["profile.compression"],
+    )
+    draco_level: bpy.props.IntProperty(
+        name="Draco Level", default=6, min=0, max=10, description=props["profile.draco_level"])
+    position_bits: bpy.props.IntProperty(
+        name="Position Bits", default=14, min=1, max=30, description=props["profile.bits"])
+    normal_bits: bpy.props.IntProperty(
+        name="Normal Bits", default=10, min=1, max=30, description=props["profile.bits"])
+    texcoord_bits: bpy.props.IntProperty(
+        name="UV Bits", default=12, min=1, max=30, description=props["profile.bits"])
+    color_bits: bpy.props.IntProperty(
+        name="Color Bits", default=10, min=1, max=30, description=props["profile.bits"])
+    generic_bits: bpy.props.IntProperty(
+        name="Generic Bits", default=12, min=1, max=30, description=props["profile.bits"])
+    image_format: bpy.props.EnumProperty(
+        name="Images",
+        items=image_formats,
+        default='AUTO',
+        description=props["profile.image_format"],
+    )
+    image_quality: bpy.props.IntProperty(
+        name="Quality", default=75, min=0, max=100, description=props["profile.image_quality"])
+    webp_fallback: bpy.props.BoolProperty(
+        name="Fallback", default=True, description=props["profile.webp_fallback"])
+    skip_unused: bpy.props.BoolProperty(
+        name="Skip Unused Data", default=True, description=props["profile.skip_unused"])
+
+
+class SCENE_UL_MergeExporter_ProfileList(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row()
+        row.prop(item, "name", text="", emboss=False, icon="PRESET")
+        row.label(text=item.compression.title())
 
 
 class COLLECTION_UL_MergeExporter_EntityList(bpy.types.UIList):
@@ -296,6 +928,68 @@ class MergeExporter_SettingsSettings(bpy.types.PropertyGroup):
         ],
         default='png',
     )
+    pipeline: bpy.props.BoolProperty(name="pipeline", default=False)
+    duplicate_mode: bpy.props.EnumProperty(
+        name="Duplication",
+        items=duplicate_modes,
+        default='DATA',
+        description=props["settings.duplicate_mode"],
+    )
+    merge_mode: bpy.props.EnumProperty(
+        name="Merging",
+        items=merge_modes,
+        default='DIRECT',
+        description=props["settings.merge_mode"],
+    )
+    modifier_mode: bpy.props.EnumProperty(
+        name="Modifiers",
+        items=modifier_modes,
+        default='EVALUATE',
+        description=props["settings.modifier_mode"],
+    )
+    bake_details: bpy.props.BoolProperty(name="bake_details", default=False)
+    use_bake_profiles: bpy.props.BoolProperty(
+        name="Bake Profiles", default=False, description=props["settings.use_bake_profiles"])
+    bake_profiles: bpy.props.PointerProperty(type=MergeExporter_BakeProfiles)
+    channel_packing: bpy.props.BoolProperty(
+        name="Channel Packing", default=False, description=props["settings.channel_packing"])
+    channel_packing_layout: bpy.props.PointerProperty(type=MergeExporter_ChannelPacking)
+    mask_rasterize: bpy.props.BoolProperty(
+        name="Rasterize Material Index", default=True, description=props["settings.mask_rasterize"])
+    isolated_bake: bpy.props.BoolProperty(
+        name="Isolated Bake", default=False, description=props["settings.isolated_bake"])
+    ao_occluders: bpy.props.PointerProperty(
+        name="AO Occluders", type=bpy.types.Collection, description=props["settings.ao_occluders"])
+    batch_bake: bpy.props.BoolProperty(
+        name="Batch Bake", default=False, description=props["settings.batch_bake"])
+    bake_cache: bpy.props.BoolProperty(
+        name="Bake Cache", default=False, description=props["settings.bake_cache"])
+    bake_cache_size: bpy.props.IntProperty(
+        name="Cache Size (MB)", default=4096, min=1, description=props["settings.bake_cache_size"])
+    memory_budget: bpy.props.BoolProperty(
+        name="Memory Budget", default=False, description=props["settings.memory_budget"])
+    memory_budget_size: bpy.props.IntProperty(
+        name="Budget (MB)", default=8192, min=64, description=props["settings.memory_budget_size"])
+    profile: bpy.props.BoolProperty(
+        name="Profile Steps", default=False, description=props["settings.profile"])
+    profile_summary: bpy.props.BoolProperty(
+        name="Summary", default=False, description=props["settings.profile_summary"])
+    incremental_export: bpy.props.BoolProperty(
+        name="Incremental Export", default=False, description=props["settings.incremental_export"])
+    scratch_scene: bpy.props.BoolProperty(
+        name="Scratch Scene", default=False, description=props["settings.scratch_scene"])
+    profiles: bpy.props.BoolProperty(name="profiles", default=False)
+    export_profiles: bpy.props.CollectionProperty(
+        type=MergeExporter_ExportProfile, name="Export Profiles")
+    export_profile_index: bpy.props.IntProperty(name="export_profile_index")
+    use_active_profile: bpy.props.BoolProperty(
+        name="Use Active Profile", default=True, description=props["settings.use_active_profile"])
+    compare_profiles: bpy.props.BoolProperty(
+        name="Compare Sizes", default=False, description=props["settings.compare_profiles"])
+    parallel_export: bpy.props.BoolProperty(
+        name="Parallel Export", default=False, description=props["settings.parallel_export"])
+    parallel_workers: bpy.props.IntProperty(
+        name="Workers", default=4, min=1, description=props["settings.parallel_workers"])
 
 
 class RENDER_PT_MergeExporterPanel(bpy.types.Panel):
@@ -358,6 +1052,12 @@ class RENDER_PT_MergeExporterPanel(bpy.types.Panel):
                     column = row.column()
                     column.prop(collection.merge_exporter_props, "origin")
 
+                    row = sub_layout.row()
+                    row.prop_search(collection.merge_exporter_props, "export_profile",
+                                    my_settings, "export_profiles")
+                    if exportables[my_settings.export_index].parent:
+                        row.active = False
+
                     sub_panel = layout.panel_prop(
                         my_settings, "object_details")
                     sub_panel[0].label(text="Object Details")
@@ -374,6 +1074,11 @@ class RENDER_PT_MergeExporterPanel(bpy.types.Panel):
 
             sub_layout = sub_panel[1]
             sub_layout.prop(collection.merge_exporter_props, "texture_size")
+
+            row = sub_layout.row().split(factor=0.33)
+            row.label(text="Method")
+            row.row().prop(collection.merge_exporter_props, "bake_method", expand=True)
+
             sub_layout.prop(my_settings, "material_count")
 
             row = sub_layout.row()
@@ -388,6 +1093,165 @@ class RENDER_PT_MergeExporterPanel(bpy.types.Panel):
             row.prop(my_settings.texture_toggles, "emission_toggle")
             row.prop(my_settings.texture_toggles, "ao_toggle")
 
+            for channel, label in channel_labels:
+                row = sub_layout.row().split(factor=0.33)
+                row.active = getattr(my_settings.texture_toggles, channel + "_toggle")
+                row.label(text=label)
+                row.prop(my_settings.texture_toggles,
+                         channel + "_resolution", text="")
+                column = row.column()
+                column.prop(my_settings.texture_toggles,
+                            channel + "_size", text="")
+                column.active = getattr(
+                    my_settings.texture_toggles, channel + "_resolution") == 'ABSOLUTE'
+
+            row = sub_layout.row()
+            row.prop(my_settings, "channel_packing")
+            row.active = my_settings.save_textures
+
+            row = sub_layout.row()
+            row.active = my_settings.channel_packing and my_settings.save_textures
+            row.prop(my_settings.channel_packing_layout, "red", text="R")
+            row.prop(my_settings.channel_packing_layout, "green", text="G")
+
+            row = sub_layout.row()
+            row.active = my_settings.channel_packing and my_settings.save_textures
+            row.prop(my_settings.channel_packing_layout, "blue", text="B")
+            row.prop(my_settings.channel_packing_layout, "alpha", text="A")
+
+            row = sub_layout.row()
+            row.prop(my_settings, "mask_rasterize")
+            row.active = my_settings.texture_toggles.mask_toggle
+
+            row = sub_layout.row()
+            row.prop(my_settings, "batch_bake")
+
+            row = sub_layout.row()
+            row.prop(my_settings, "isolated_bake")
+            column = row.column()
+            column.prop(my_settings, "ao_occluders", text="")
+            column.active = my_settings.isolated_bake and my_settings.texture_toggles.ao_toggle
+
+            row = sub_layout.row()
+            row.prop(my_settings, "bake_cache")
+            column = row.column()
+            column.prop(my_settings, "bake_cache_size")
+            column.active = my_settings.bake_cache
+
+        sub_panel = layout.panel_prop(my_settings, "bake_details")
+        sub_panel[0].label(text="Bake Profiles")
+        if sub_panel[1]:
+            sub_layout = sub_panel[1]
+            sub_layout.active = collection.merge_exporter_props.bake
+            sub_layout.prop(my_settings, "use_bake_profiles")
+
+            for channel, label in channel_labels:
+                profile = getattr(my_settings.bake_profiles, channel)
+
+                column = sub_layout.column()
+                column.active = my_settings.use_bake_profiles
+                column.label(text=label)
+
+                row = column.row()
+                row.prop(profile, "samples")
+                row.prop(profile, "use_denoising")
+
+                row = column.row()
+                row.prop(profile, "margin")
+                row.prop(profile, "margin_type", text="")
+
+                column.prop(profile, "tile_size")
+
+        sub_panel = layout.panel_prop(my_settings, "pipeline")
+        sub_panel[0].label(text="Pipeline")
+        if sub_panel[1]:
+            sub_layout = sub_panel[1]
+
+            row = sub_layout.row().split(factor=0.33)
+            row.label(text="Duplication")
+            row.row().prop(my_settings, "duplicate_mode", expand=True)
+
+            row = sub_layout.row().split(factor=0.33)
+            row.label(text="Merging")
+            row.row().prop(my_settings, "merge_mode", expand=True)
+
+            row = sub_layout.row().split(factor=0.33)
+            row.label(text="Modifiers")
+            row.row().prop(my_settings, "modifier_mode", expand=True)
+
+            row = sub_layout.row()
+            row.prop(my_settings, "incremental_export")
+            row.prop(my_settings, "scratch_scene")
+
+            row = sub_layout.row()
+            row.prop(my_settings, "profile")
+            column = row.column()
+            column.prop(my_settings, "profile_summary")
+            column.active = my_settings.profile
+
+            row = sub_layout.row()
+            row.prop(my_settings, "memory_budget")
+            column = row.column()
+            column.prop(my_settings, "memory_budget_size")
+            column.active = my_settings.memory_budget
+
+            row = sub_layout.row()
+            row.prop(my_settings, "parallel_export")
+            column = row.column()
+            column.prop(my_settings, "parallel_workers")
+            column.active = my_settings.parallel_export
+
+        sub_panel = layout.panel_prop(my_settings, "profiles")
+        sub_panel[0].label(text="Export Profiles")
+        if sub_panel[1]:
+            sub_layout = sub_panel[1]
+
+            row = sub_layout.row()
+            row.template_list("SCENE_UL_MergeExporter_ProfileList", "", my_settings,
+                              "export_profiles", my_settings, "export_profile_index")
+            column = row.column(align=True)
+            column.operator("scene.merge_export_profile_add", text="", icon="ADD")
+            column.operator("scene.merge_export_profile_remove",
+                            text="", icon="REMOVE")
+
+            sub_layout.prop(my_settings, "use_active_profile")
+
+            if my_settings.export_profile_index < len(my_settings.export_profiles):
+                profile = my_settings.export_profiles[my_settings.export_profile_index]
+
+                row = sub_layout.row().split(factor=0.33)
+                row.label(text="Compression")
+                row.row().prop(profile, "compression", expand=True)
+
+                column = sub_layout.column()
+                column.active = profile.compression != 'NONE'
+                row = column.row()
+                row.prop(profile, "draco_level")
+                row.active = profile.compression == 'DRACO'
+                row = column.row()
+                row.prop(profile, "position_bits")
+                row.prop(profile, "normal_bits")
+                row = column.row()
+                row.prop(profile, "texcoord_bits")
+                row.prop(profile, "color_bits")
+                row = column.row()
+                row.prop(profile, "generic_bits")
+                row.active = profile.compression == 'DRACO'
+
+                row = sub_layout.row().split(factor=0.33)
+                row.label(text="Images")
+                row.row().prop(profile, "image_format", expand=True)
+
+                row = sub_layout.row()
+                row.prop(profile, "image_quality")
+                column = row.column()
+                column.prop(profile, "webp_fallback")
+                column.active = profile.image_format == 'WEBP'
+
+                sub_layout.prop(profile, "skip_unused")
+
+            sub_layout.prop(my_settings, "compare_profiles")
+
         row = layout.row().split(factor=0.33)
         row.label(text="Export Format")
 
@@ -410,6 +1274,14 @@ classes = [
     COLLECTION_UL_MergeExporter_EntityList,
     OBJECT_UL_MergeExporter_ObjectList,
     MergeExporter_TextureToggles,
+    MergeExporter_BakeProfile,
+    MergeExporter_AOBakeProfile,
+    MergeExporter_BakeProfiles,
+    MergeExporter_ChannelPacking,
+    MergeExporter_ExportProfile,
+    SCENE_OT_MergeExportProfileAdd,
+    SCENE_OT_MergeExportProfileRemove,
+    SCENE_UL_MergeExporter_ProfileList,
     MergeExporter_SettingsSettings,
     RENDER_PT_MergeExporterPanel
 ]
@@ -420,24 +1292,52 @@ def menu_func_export(self, context):
                          text="Merge Export (.glb, .fbx)")
 
 
-def gather(collection, parent):
-    entry = bpy.context.scene.merge_exporter_settings.collections.add()
-    entry.collection = collection
-    entry.parent = parent
+def gather(collection, parent, entries):
+    entries.append((collection, parent))
 
     for child in collection.children:
-        gather(child, collection)
+        gather(child, collection, entries)
+
+
+def sync_collections(scene):
+    entries = []
+
+    for collection in scene.collection.children:
+        gather(collection, None, entries)
+
+    exportables = scene.merge_exporter_settings.collections
+
+    for i, entry in enumerate(entries):
+        if i < len(exportables):
+            exportable = exportables[i]
+
+            if exportable.collection == entry[0] and exportable.parent == entry[1]:
+                continue
+        else:
+            exportable = exportables.add()
+
+        exportable.collection = entry[0]
+        exportable.parent = entry[1]
+
+    while len(exportables) > len(entries):
+        exportables.remove(len(exportables) - 1)
+
+
+collection_shape = None
 
 
 @bpy.app.handlers.persistent
-def depsgraph_update_post(dummy1, dummy2):
-    bpy.context.scene.merge_exporter_settings.collections.clear()
+def depsgraph_update_post(scene, depsgraph):
+    global collection_shape
 
-    for collection in bpy.context.scene.collection.children:
-        gather(collection, None)
+    shape = (scene.name, len(bpy.data.collections),
+             len(scene.collection.children))
 
+    if shape == collection_shape and not depsgraph.id_type_updated('COLLECTION'):
+        return
 
-bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_post)
+    collection_shape = shape
+    sync_collections(scene)
 
 
 def register():
@@ -449,9 +1349,17 @@ def register():
     bpy.types.Scene.merge_exporter_settings = bpy.props.PointerProperty(
         type=MergeExporter_SettingsSettings)
     bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_post)
 
 
 def unregister():
+    global collection_shape
+
+    if depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_post)
+
+    collection_shape = None
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
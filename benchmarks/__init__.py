@@ -0,0 +1,5 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
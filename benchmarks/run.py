@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+# Benchmark entry point:
+#
+#   blender -b --factory-startup --python benchmarks/run.py --
+#       [--scenarios NAME ...] [--baseline PATH] [--threshold 0.10]
+#       [--update-baseline]
+#
+# Every scenario runs in its own background Blender process so that
+# peak memory is measured per scenario.
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bpy
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+benchmarks_path = os.path.dirname(os.path.abspath(__file__))
+package_path = os.path.dirname(benchmarks_path)
+
+
+def load_addon():
+    sys.path.insert(0, os.path.dirname(package_path))
+    cli = importlib.import_module(os.path.basename(package_path) + ".cli")
+
+    return cli.load_addon()
+
+
+def load_scenes():
+    sys.path.insert(0, benchmarks_path)
+
+    return importlib.import_module("scenes")
+
+
+def run_scenario(name, result_path):
+    addon = load_addon()
+    scenes = load_scenes()
+
+    with tempfile.TemporaryDirectory() as path:
+        root = scenes.generate(scenes.scenarios[name], path)
+
+        settings = bpy.context.scene.merge_exporter_settings
+        settings.profile = True
+
+        tracemalloc.start()
+        step_shared = addon.steps.StepShared()
+
+        start = time.perf_counter()
+        addon.steps.execute(bpy.context, root, step_shared)
+        seconds = time.perf_counter() - start
+
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    steps = {}
+
+    for step, total in step_shared.profiler.totals.items():
+        steps[step] = total["enter"] + total["exit"]
+
+    peak_rss = 0
+
+    if resource != None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    result = {
+        "seconds": seconds,
+        "steps": steps,
+        "python_peak": python_peak,
+        "peak_rss": peak_rss,
+    }
+
+    with open(result_path, "w") as file:
+        json.dump(result, file)
+
+    return 0
+
+
+def spawn_scenario(name):
+    handle, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+
+    command = [
+        bpy.app.binary_path, "-b", "--factory-startup",
+        "--python-exit-code", "1",
+        "--python", os.path.abspath(__file__),
+        "--", "--scenario", name, "--result", result_path,
+    ]
+
+    try:
+        process = subprocess.run(command, capture_output=True, text=True)
+
+        if process.returncode != 0:
+            print(process.stdout + process.stderr)
+            return None
+
+        with open(result_path) as file:
+            return json.load(file)
+    finally:
+        os.remove(result_path)
+
+
+def compare(results, baseline, threshold, minimum):
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        metrics = [("seconds", result["seconds"], baseline[name]["seconds"])]
+        metrics.append(("peak_rss", result["peak_rss"],
+                       baseline[name]["peak_rss"]))
+
+        for step, seconds in result["steps"].items():
+            if step in baseline[name]["steps"]:
+                metrics.append(
+                    (step, seconds, baseline[name]["steps"][step]))
+
+        for metric, current, previous in metrics:
+            if metric != "peak_rss" and current - previous < minimum:
+                continue
+
+            if current > previous * (1.00 + threshold):
+                regressions.append((name, metric, previous, current))
+
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="blender -b --factory-startup --python benchmarks/run.py --")
+    parser.add_argument("--scenarios", nargs="*", default=None)
+    parser.add_argument("--baseline", default=os.path.join(
+        benchmarks_path, "baseline.json"))
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--minimum", type=float, default=0.05)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--scenario", default=None)
+    parser.add_argument("--result", default=None)
+    args = parser.parse_args(argv)
+
+    if args.scenario != None:
+        return run_scenario(args.scenario, args.result)
+
+    names = args.scenarios or list(load_scenes().scenarios)
+    results = {}
+
+    for name in names:
+        result = spawn_scenario(name)
+
+        if result == None:
+            print("benchmark %s failed" % name)
+            return 1
+
+        results[name] = result
+        print("benchmark %-8s %8.3f s  peak %8.1f MiB" %
+              (name, result["seconds"], result["peak_rss"] / (1024 * 1024)))
+
+        for step, seconds in sorted(result["steps"].items(), key=lambda item: -item[1]):
+            print("    %-24s %8.3f s" % (step, seconds))
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=4)
+
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("no baseline at %s, run with --update-baseline" % args.baseline)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    regressions = compare(results, baseline, args.threshold, args.minimum)
+
+    for name, metric, previous, current in regressions:
+        print("regression in %s %s: %.3f -> %.3f" %
+              (name, metric, previous, current))
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        sys.exit(main(sys.argv[sys.argv.index("--") + 1:]))
+
+    sys.exit(main([]))
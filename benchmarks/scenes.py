@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import math
+
+import bmesh
+import bpy
+import numpy
+
+scenarios = {
+    "small": {
+        "depth": 1,
+        "width": 2,
+        "objects": 4,
+        "vertices": 400,
+        "shape_keys": 0,
+        "mirror": False,
+        "array": False,
+        "armature": False,
+        "materials": 2,
+        "outline_correction": False,
+        "bake": False,
+        "texture_size": 256,
+        "samples": 1,
+    },
+    "medium": {
+        "depth": 2,
+        "width": 3,
+        "objects": 8,
+        "vertices": 2500,
+        "shape_keys": 4,
+        "mirror": True,
+        "array": True,
+        "armature": False,
+        "materials": 4,
+        "outline_correction": True,
+        "bake": True,
+        "texture_size": 512,
+        "samples": 1,
+    },
+    "large": {
+        "depth": 3,
+        "width": 3,
+        "objects": 16,
+        "vertices": 10000,
+        "shape_keys": 8,
+        "mirror": True,
+        "array": True,
+        "armature": True,
+        "materials": 5,
+        "outline_correction": True,
+        "bake": True,
+        "texture_size": 1024,
+        "samples": 4,
+    },
+}
+
+
+def clear_scene():
+    for collection in [bpy.data.objects, bpy.data.meshes, bpy.data.materials,
+                       bpy.data.armatures, bpy.data.images]:
+        for datablock in list(collection):
+            collection.remove(datablock)
+
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+
+
+def create_materials(count):
+    materials = []
+
+    for i in range(0, count):
+        material = bpy.data.materials.new(name="bench.material.%d" % i)
+        material.use_nodes = True
+
+        nodes = material.node_tree.nodes
+        bsdf = nodes.get("Principled BSDF")
+        bsdf.inputs[0].default_value = (i / max(count, 1), 0.50, 0.50, 1.00)
+
+        target = nodes.new(type='ShaderNodeTexImage')
+        target.location = (-400, 300)
+
+        materials.append(material)
+
+    return materials
+
+
+def create_mesh(name, vertices, materials, seed):
+    segments = max(2, int(math.sqrt(vertices)))
+    mesh = bpy.data.meshes.new(name)
+
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=segments,
+                          y_segments=segments, size=1.00, calc_uvs=True)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    for material in materials:
+        mesh.materials.append(material)
+
+    indices = numpy.random.default_rng(seed).integers(
+        0, max(len(materials), 1), len(mesh.polygons), dtype=numpy.int32)
+    mesh.polygons.foreach_set("material_index", indices)
+
+    return mesh
+
+
+def add_shape_keys(object, count, seed):
+    if count == 0:
+        return
+
+    rng = numpy.random.default_rng(seed)
+    object.shape_key_add(name="Basis", from_mix=False)
+
+    for i in range(0, count):
+        block = object.shape_key_add(name="key.%d" % i, from_mix=False)
+        co = numpy.empty(len(block.data) * 3, numpy.float32)
+        block.data.foreach_get("co", co)
+        co += rng.normal(0.00, 0.05, len(co)).astype(numpy.float32)
+        block.data.foreach_set("co", co)
+
+
+def create_armature(collection):
+    armature = bpy.data.armatures.new("bench.armature")
+    object = bpy.data.objects.new("bench.armature", armature)
+    collection.objects.link(object)
+
+    bpy.context.view_layer.objects.active = object
+    bpy.ops.object.mode_set(mode='EDIT')
+    bone = armature.edit_bones.new("Bone")
+    bone.head = (0.00, 0.00, 0.00)
+    bone.tail = (0.00, 0.00, 1.00)
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    return object
+
+
+def populate(collection, params, materials, path, seed):
+    props = collection.merge_exporter_props
+    props.active = True
+    props.bake = params["bake"]
+    props.materialize = True
+    props.outline_correction = params["outline_correction"]
+    props.texture_size = params["texture_size"]
+    props.path = path
+
+    armature = None
+
+    if params["armature"]:
+        armature = create_armature(collection)
+
+    for i in range(0, params["objects"]):
+        name = "%s.object.%d" % (collection.name, i)
+        mesh = create_mesh(name, params["vertices"], materials, seed + i)
+        object = bpy.data.objects.new(name, mesh)
+        object.location = (i * 2.50, seed * 0.10, 0.00)
+        collection.objects.link(object)
+
+        add_shape_keys(object, params["shape_keys"], seed + i)
+
+        if params["mirror"]:
+            object.modifiers.new(name="Mirror", type='MIRROR')
+
+        if params["array"]:
+            object.modifiers.new(name="Array", type='ARRAY').count = 2
+
+        if armature != None:
+            group = object.vertex_groups.new(name="Bone")
+            group.add(range(0, len(mesh.vertices)), 1.00, 'REPLACE')
+            modifier = object.modifiers.new(name="Armature", type='ARMATURE')
+            modifier.object = armature
+
+
+def create_tree(parent, params, materials, path, depth, seed):
+    for i in range(0, params["width"]):
+        collection = bpy.data.collections.new("%s.%d" % (parent.name, i))
+        parent.children.link(collection)
+
+        seed = seed * params["width"] + i + 1
+        populate(collection, params, materials, path, seed)
+
+        if depth > 1:
+            create_tree(collection, params, materials, path, depth - 1, seed)
+
+
+def generate(params, path):
+    clear_scene()
+
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = params["samples"]
+
+    materials = create_materials(params["materials"])
+
+    root = bpy.data.collections.new("bench")
+    scene.collection.children.link(root)
+    populate(root, params, materials, path, 0)
+
+    if params["depth"] > 1:
+        create_tree(root, params, materials, path, params["depth"] - 1, 0)
+
+    settings = scene.merge_exporter_settings
+    settings.material_count = max(params["materials"], 2)
+
+    return root
@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+# Batch export entry point:
+#
+#   blender -b --python cli.py -- [--workers N] [--roots NAME] ...
+#                                 [--summary PATH] FILE [FILE ...]
+#
+# Every file is exported by its own background Blender process, with at
+# most N processes running at once. --roots takes one collection name and
+# can be repeated.
+
+import argparse
+import concurrent.futures
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+
+def load_addon():
+    package_path = os.path.dirname(os.path.abspath(__file__))
+    package_name = os.path.basename(package_path)
+
+    for name, module in list(sys.modules.items()):
+        if name.rsplit(".", 1)[-1] != package_name:
+            continue
+
+        if hasattr(module, "steps") and hasattr(module, "register"):
+            break
+    else:
+        sys.path.insert(0, os.path.dirname(package_path))
+        module = importlib.import_module(package_name)
+
+    # The module may be imported without the add-on being enabled in this process.
+    if not hasattr(bpy.types.Scene, "merge_exporter_settings"):
+        module.register()
+
+    return module
+
+
+def add_totals(totals, added):
+    for name, total in added.items():
+        entry = totals.setdefault(name, {"enter": 0.00, "exit": 0.00})
+        entry["enter"] += total["enter"]
+        entry["exit"] += total["exit"]
+
+
+def run_worker(roots, result_path):
+    addon = load_addon()
+    context = bpy.context
+    outputs = []
+    skipped = []
+    timings = {}
+    memory_peaks = {}
+    export_sizes = {}
+    missing_profiles = []
+    profile_totals = {}
+
+    texture_writer = addon.steps.textures.create_writer(
+        context.scene.merge_exporter_settings)
+
+    try:
+        for collection in list(context.scene.collection.children):
+            if roots and collection.name not in roots:
+                continue
+
+            step_shared = addon.steps.StepShared()
+            step_shared.texture_writer = texture_writer
+            addon.steps.execute(context, collection, step_shared)
+            outputs.extend(step_shared.exported)
+            skipped.extend(step_shared.skipped)
+            memory_peaks.update(step_shared.memory_peaks)
+            export_sizes.update(step_shared.export_sizes)
+            missing_profiles.extend(step_shared.missing_profiles)
+
+            for name, seconds in step_shared.timings.items():
+                timings[name] = timings.get(name, 0.00) + seconds
+
+            if step_shared.profiler != None:
+                add_totals(profile_totals, step_shared.profiler.totals)
+    finally:
+        texture_writer.close()
+
+    with open(result_path, "w") as file:
+        json.dump({"outputs": outputs, "skipped": skipped, "timings": timings,
+                  "memory_peaks": memory_peaks, "export_sizes": export_sizes,
+                   "missing_profiles": missing_profiles, "profile_totals": profile_totals}, file)
+
+    return 0
+
+
+def run_job(blender, path, roots):
+    handle, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+
+    command = [
+        blender, "-b", path,
+        "--python-exit-code", "1",
+        "--python", os.path.abspath(__file__),
+        "--", "--worker", "--result", result_path,
+    ]
+
+    for root in roots or []:
+        command += ["--roots", root]
+
+    start = time.perf_counter()
+    process = subprocess.run(command, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+
+    result = {"outputs": [], "skipped": [], "timings": {},
+              "memory_peaks": {}, "export_sizes": {}, "missing_profiles": [], "profile_totals": {}}
+
+    try:
+        with open(result_path) as file:
+            result = json.load(file)
+    except (OSError, ValueError):
+        pass
+    finally:
+        os.remove(result_path)
+
+    return {
+        "file": path,
+        "roots": list(roots or []),
+        "status": process.returncode,
+        "seconds": seconds,
+        "outputs": result["outputs"],
+        "skipped": result["skipped"],
+        "timings": result["timings"],
+        "memory_peaks": result["memory_peaks"],
+        "export_sizes": result["export_sizes"],
+        "missing_profiles": result["missing_profiles"],
+        "profile_totals": result["profile_totals"],
+        "log": process.stdout + process.stderr,
+    }
+
+
+def run_pool(jobs, workers, blender=None, callback=None):
+    if blender == None:
+        blender = bpy.app.binary_path
+
+    results = [None] * len(jobs)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(run_job, blender, job[0], job[1]): i for i, job in enumerate(jobs)
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+
+            if callback != None:
+                callback(results[i])
+
+    return results
+
+
+def print_progress(result):
+    state = "ok" if result["status"] == 0 else "failed (%d)" % result["status"]
+    name = result["file"]
+
+    if len(result["roots"]) > 0:
+        name += " [" + ", ".join(result["roots"]) + "]"
+
+    print("merge export: %s %s in %.2f s" %
+          (name, state, result["seconds"]), flush=True)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="blender -b --python cli.py --")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--roots", action="append", default=[])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--summary", default="merge_export_summary.json")
+    parser.add_argument("--blender", default=None)
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--result", default=None)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        return run_worker(args.roots, args.result)
+
+    if len(args.files) == 0:
+        print("merge export: no files given")
+        return 1
+
+    jobs = [(os.path.abspath(path), args.roots) for path in args.files]
+
+    start = time.perf_counter()
+    results = run_pool(jobs, args.workers, args.blender, print_progress)
+    seconds = time.perf_counter() - start
+
+    failed = [result for result in results if result["status"] != 0]
+
+    with open(args.summary, "w") as file:
+        json.dump({
+            "workers": args.workers,
+            "seconds": seconds,
+            "failed": len(failed),
+            "jobs": results,
+        }, file, indent=4)
+
+    return 1 if len(failed) > 0 else 0
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        sys.exit(main(sys.argv[sys.argv.index("--") + 1:]))
+
+    sys.exit(main([]))
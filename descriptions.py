@@ -11,5 +11,42 @@ props = {
     "collection.origin": """Origin object.""",
     "collection.use_origin_scale": """Preserve scale on export.""",
     "collection.export_origin": """Include origin in export.""",
-    "collection.override_name": """Override name for merged mesh and file."""
+    "collection.override_name": """Override name for merged mesh and file.""",
+    "collection.bake_method": """Bake textures with Cycles, or copy the images of image textured Principled BSDFs into an atlas and remap the UVs. Collections with other materials, UVs outside the 0 to 1 range or ambient occlusion enabled are baked with Cycles.""",
+    "collection.export_profile": """Export profile used for this collection instead of the active one. A name that no longer matches a profile falls back to the active one.""",
+    "settings.use_active_profile": """Export collections without their own profile with the selected profile. When off, they are exported with the exporter's default options.""",
+    "settings.duplicate_mode": """Duplicate meshes through the data API in one pass, or through the duplicate operator one object at a time.""",
+    "settings.merge_mode": """Concatenate meshes directly with NumPy, or join them with the join operator. Meshes with vertex groups or mirrored transforms always use the join operator.""",
+    "settings.modifier_mode": """Apply the modifier stack in one depsgraph evaluation, or apply each modifier with the modifier apply operator.""",
+    "settings.use_bake_profiles": """Bake every texture with its own samples, margin, denoising and tile size instead of the scene's Cycles settings. Restored after every bake.""",
+    "settings.channel_packing": """Merge single-channel textures into one <collection>.packed texture, which is saved instead of the separate files and used by the merged material. Needs Save Textures.""",
+    "channel_packing.component": """Texture stored in this channel of the packed texture.""",
+    "texture_toggles.resolution": """Resolution of this texture as a fraction of the collection's texture size, or an absolute size.""",
+    "texture_toggles.size": """Absolute resolution of this texture.""",
+    "bake_profile.samples": """Cycles samples for this texture. Albedo, normal, roughness, material index and emission are deterministic and only need one.""",
+    "bake_profile.margin": """Pixels to extend the baked result beyond the UV islands.""",
+    "bake_profile.use_denoising": """Denoise the baked result.""",
+    "bake_profile.tile_size": """Cycles tile size while baking this texture.""",
+    "settings.mask_rasterize": """Write the material index texture by rasterizing the UVs of every triangle instead of baking it with Cycles. The bake margin is filled by extending the edges.""",
+    "settings.batch_bake": """Bake the collections of an export together, with one Cycles bake per texture. Collections sharing materials with each other, and exports that bake the material index with Cycles, are baked one collection at a time.""",
+    "settings.isolated_bake": """Bake in a temporary scene that only contains the baked meshes, so Cycles does not sync the rest of the scene. Lights are not included.""",
+    "settings.ao_occluders": """Collection of meshes that also cast ambient occlusion in an isolated bake.""",
+    "settings.bake_cache": """Reuse baked textures from disk when the geometry, UVs, materials and bake settings are unchanged.""",
+    "settings.bake_cache_size": """Size limit of the bake cache. The least recently used entries are removed first.""",
+    "settings.memory_budget": """Free baked images once Save Textures has written them and wait for pending texture writes when the budget would be exceeded. Only textures being saved count against the budget, baked images are kept in memory when Save Textures is off.""",
+    "settings.memory_budget_size": """Peak memory allowed for the texture writer, counting the tracked baked images and the pending writes.""",
+    "settings.profile": """Record the time, Python allocations, datablock counts and geometry of every step into a Chrome trace next to the export.""",
+    "settings.profile_summary": """Report the time spent in every step in the Info editor.""",
+    "settings.incremental_export": """Skip collections whose contents, settings and exported files are unchanged since the last export.""",
+    "settings.scratch_scene": """Run the export in a temporary scene that only contains the exported objects, leaving the visibility and selection in the current scene untouched.""",
+    "settings.compare_profiles": """Also export every profile into a temporary directory and report the resulting sizes.""",
+    "settings.parallel_export": """Save a temporary copy of the file and export every active root collection in its own background Blender process.""",
+    "settings.parallel_workers": """Number of background Blender processes running at once.""",
+    "profile.compression": """Compress geometry with Draco, or quantize it with gltfpack into KHR_mesh_quantization. Only applies to glTF.""",
+    "profile.draco_level": """Draco compression level. Higher levels produce smaller files but take longer to encode and decode.""",
+    "profile.bits": """Quantization bits. Fewer bits produce smaller files at the cost of precision.""",
+    "profile.image_format": """Image format of the exported textures.""",
+    "profile.image_quality": """Quality of lossy WebP and JPEG images.""",
+    "profile.webp_fallback": """Also export PNG or JPEG images for viewers without WebP support.""",
+    "profile.skip_unused": """Skip custom attributes, tangents, unused images and vertex colors that no material uses.""",
 }
@@ -4,114 +4,218 @@
 # Licensed under the GNU General Public License v3.0 or later
 # See the LICENSE file in the top-level directory for details.
 
+import contextlib
 import os
 
 import bpy
 import importlib
 import numpy
 
+from . import atlas, bake_cache, fingerprint, packing, rasterize, textures
 from .final import ReoriginStep, ReparentStep, MergeMeshesStep, ExportStep
-from .materials import BakeStep, MaterializeStep, SaveTexturesStep
+from .materials import AtlasStep, BakeStep, MaterializeStep, PackChannelsStep, SaveTexturesStep, batch_bake
 from .modifiers import DeleteShapeKeysStep, CopyShapeKeysStep, ApplyModifiersStep
 from .outlines import OutlineCorrectionStep
-from .preparations import ObjectModeStep, UnhideStep
+from .preparations import ObjectModeStep, ScratchSceneStep, UnhideStep
 from .preservation import PreserveSelectionsStep, RenameStep, UnrenameStep, DuplicateStep
-from .step import StepShared, InitialStep
+from .profiling import Profiler
+from .step import StepShared, InitialStep, output_path
 
 
 def reload():
+    importlib.reload(merging)
+    importlib.reload(fingerprint)
+    importlib.reload(textures)
+    importlib.reload(atlas)
+    importlib.reload(packing)
+    importlib.reload(rasterize)
+    importlib.reload(bake_cache)
     importlib.reload(final)
     importlib.reload(materials)
     importlib.reload(modifiers)
     importlib.reload(outlines)
     importlib.reload(preparations)
     importlib.reload(preservation)
+    importlib.reload(profiling)
     importlib.reload(step)
 
 
 reload()
 
 
-def gather(collection, stack, parent_shared):
-    if not collection.merge_exporter_props.active:
-        return
+def gather(collection):
+    stack = []
+    pending = [(collection, None)]
 
-    shared = {
-        "parent": collection,
-        "parent_object": None,
-    }
+    while len(pending) > 0:
+        collection, parent_shared = pending.pop()
 
-    stack.append((collection, shared, parent_shared))
+        if not collection.merge_exporter_props.active:
+            continue
 
-    for child in collection.children:
-        gather(child, stack, shared)
+        shared = {
+            "parent": collection,
+            "parent_object": None,
+            "objects": [],
+            "children": [],
+        }
 
+        if parent_shared != None:
+            parent_shared["children"].append(shared)
 
-def execute(context, collection):
-    stack = []
-    gather(collection, stack, None)
+        stack.append((collection, shared, parent_shared))
+
+        for child in collection.children:
+            pending.append((child, shared))
+
+    stack.reverse()
+
+    return stack
+
+
+def execute(context, collection, step_shared=None):
+    stack = gather(collection)
 
     if len(stack) == 0:
         return False
 
-    step_shared = StepShared()
-    step_shared.encountered_data = {}
-    step_shared.encountered_materials = {}
-
-    with (
-        ObjectModeStep(context) as s,
-        PreserveSelectionsStep(context) as s,
-    ):
-        return execute_inner(context, [], stack, collection, step_shared)
-
-
-def execute_inner(context, objects, stack, root, step_shared):
-    entry = stack.pop(0)
-    collection = entry[0]
-    shared = entry[1]
-    parent_shared = entry[2]
-
-    with (
-        InitialStep(context, collection, root, step_shared, list(collection.objects)) as s,
-        UnhideStep(s) as s,
-        RenameStep(s) as s,
-        BakeStep(s) as s,
-        DuplicateStep(s) as s,
-        DeleteShapeKeysStep(s) as s,
-        OutlineCorrectionStep(s) as s,
-        ApplyModifiersStep(s) as s,
-        CopyShapeKeysStep(s) as s,
-        MergeMeshesStep(s) as s,
-        MaterializeStep(s) as s,
-        SaveTexturesStep(s) as s,
-        UnrenameStep(s) as s,
-        ReoriginStep(s) as s,
-        ReparentStep(s) as s,
-    ):
-        objects.extend(s.objects_forward)
-
-        for object in s.objects_forward:
-            if object.type == "MESH":
-                shared["parent_object"] = object
-                break
-
-        if parent_shared:
-            parent_object = parent_shared["parent_object"]
-
-            if parent_object:
-                for object in s.objects_forward:
-                    if object.parent != "MESH":
-                        continue
-
-                    object.parent = parent_object
-                    object.matrix_parent_inverse = parent_object.matrix_world.inverted()
-
-        if len(stack) > 0:
-            return execute_inner(context, objects, stack, root, step_shared)
+    owned = step_shared == None
+
+    if owned:
+        step_shared = StepShared()
+
+    digest = None
+
+    if context.scene.merge_exporter_settings.incremental_export:
+        digest = fingerprint.compute(context, stack)
 
+        if fingerprint.is_current(collection, digest):
+            step_shared.skipped.append(collection.name)
+            return False
+
+    exported = len(step_shared.exported)
+    settings = context.scene.merge_exporter_settings
+    step_shared.profiler = Profiler(settings.profile)
+
+    if settings.scratch_scene:
+        isolation = ScratchSceneStep(
+            context, [object for entry in stack for object in entry[0].objects])
+    else:
+        isolation = PreserveSelectionsStep(context)
+
+    try:
         with (
-            InitialStep(context, root, root, step_shared, list(objects)) as s,
-            UnhideStep(s),
-            ExportStep(s),
+            step_shared.profiler.wrap(ObjectModeStep(context)) as s,
+            step_shared.profiler.wrap(isolation) as s,
         ):
-            return True
+            result = execute_inner(context, stack, collection, step_shared)
+
+        if settings.profile:
+            step_shared.profiler.write(output_path(collection, ".trace.json"))
+    finally:
+        step_shared.profiler.close()
+
+    if step_shared.texture_writer != None and (owned or digest != None):
+        step_shared.texture_writer.wait()
+
+        if owned:
+            step_shared.texture_writer.close()
+
+    if digest != None:
+        fingerprint.store(collection, digest, step_shared.exported[exported:])
+
+    return result
+
+
+pipeline = [
+    UnhideStep,
+    RenameStep,
+    BakeStep,
+    DuplicateStep,
+    DeleteShapeKeysStep,
+    OutlineCorrectionStep,
+    ApplyModifiersStep,
+    CopyShapeKeysStep,
+    MergeMeshesStep,
+    AtlasStep,
+    PackChannelsStep,
+    MaterializeStep,
+    SaveTexturesStep,
+    UnrenameStep,
+    ReoriginStep,
+    ReparentStep,
+]
+
+
+def purge_meshes(meshes, kept):
+    for mesh in [mesh for mesh in bpy.data.meshes if mesh not in meshes]:
+        if mesh.users == 0 and mesh not in kept:
+            bpy.data.meshes.remove(mesh)
+
+
+def reparent(shared):
+    parent_object = shared["parent_object"]
+
+    if parent_object == None:
+        return
+
+    for child_shared in shared["children"]:
+        for object in child_shared["objects"]:
+            if object.type != "MESH":
+                continue
+
+            object.parent = parent_object
+            object.matrix_parent_inverse = parent_object.matrix_world.inverted()
+
+
+def execute_inner(context, stack, root, step_shared):
+    objects = []
+    profiler = step_shared.profiler
+    initial_meshes = set(bpy.data.meshes)
+
+    if context.scene.merge_exporter_settings.batch_bake:
+        batch_bake(context, stack, step_shared)
+
+    # Steps whose teardown would change what gets exported stay entered until the export,
+    # everything else is unwound once the parent collection has picked up the result.
+    with contextlib.ExitStack() as result_stack:
+        for collection, shared, parent_shared in stack:
+            meshes = set(bpy.data.meshes)
+            exit_stack = result_stack.enter_context(contextlib.ExitStack())
+            shared["exit_stack"] = exit_stack
+
+            s = exit_stack.enter_context(profiler.wrap(
+                InitialStep(context, collection, root, step_shared, list(collection.objects))))
+
+            for step in pipeline:
+                if step.holds_result:
+                    s = result_stack.enter_context(profiler.wrap(step(s)))
+                else:
+                    s = exit_stack.enter_context(profiler.wrap(step(s)))
+
+            purge_meshes(meshes, set(step_shared.encountered_data.values()))
+
+            shared["objects"] = list(s.objects_forward)
+            objects.extend(s.objects_forward)
+
+            for object in s.objects_forward:
+                if object.type == "MESH":
+                    shared["parent_object"] = object
+                    break
+
+            reparent(shared)
+
+            for child_shared in shared["children"]:
+                child_shared["exit_stack"].close()
+
+        stack[-1][1]["exit_stack"].close()
+
+        with contextlib.ExitStack() as export_stack:
+            s = export_stack.enter_context(profiler.wrap(
+                InitialStep(context, root, root, step_shared, list(objects))))
+            export_stack.enter_context(profiler.wrap(UnhideStep(s)))
+            export_stack.enter_context(profiler.wrap(ExportStep(s)))
+
+    purge_meshes(initial_meshes, set())
+
+    return True
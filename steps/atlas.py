@@ -0,0 +1,378 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import math
+
+import bpy
+import numpy
+
+from .merging import read
+from .textures import channel_size, read_pixels, write_pixels, linear_to_srgb, srgb_to_linear
+
+padding = 2
+constant_size = 4
+bounds_epsilon = 0.001
+
+backgrounds = {
+    "albedo": (0.00, 0.00, 0.00, 1.00),
+    "normal": (0.50, 0.50, 1.00, 1.00),
+    "rough": (1.00, 1.00, 1.00, 1.00),
+    "mask": (0.00, 0.00, 0.00, 1.00),
+    "emission": (0.00, 0.00, 0.00, 1.00),
+}
+
+
+def linked_image(socket):
+    link = socket.links[0]
+    node = link.from_node
+
+    if node.type != 'TEX_IMAGE' or node.image == None or node.image.size[0] == 0:
+        return None
+
+    if node.inputs["Vector"].is_linked or node.projection != 'FLAT':
+        return None
+
+    return ("image", node.image, link.from_socket.name)
+
+
+def describe_socket(socket):
+    if not socket.is_linked:
+        value = socket.default_value
+
+        if isinstance(value, float):
+            return ("value", (value, value, value, 1.00))
+
+        return ("value", (value[0], value[1], value[2], 1.00))
+
+    return linked_image(socket)
+
+
+def describe_normal(socket):
+    if not socket.is_linked:
+        return ("value", backgrounds["normal"])
+
+    node = socket.links[0].from_node
+
+    if node.type != 'NORMAL_MAP' or node.space != 'TANGENT':
+        return None
+
+    if node.inputs["Strength"].is_linked or node.inputs["Strength"].default_value != 1.00:
+        return None
+
+    if not node.inputs["Color"].is_linked:
+        return ("value", backgrounds["normal"])
+
+    return linked_image(node.inputs["Color"])
+
+
+def describe(material):
+    # Only image textured Principled BSDFs can be copied, anything else needs Cycles.
+    if material == None or not material.use_nodes:
+        return None
+
+    output = material.node_tree.get_output_node('ALL')
+
+    if output == None or not output.inputs["Surface"].is_linked:
+        return None
+
+    bsdf = output.inputs["Surface"].links[0].from_node
+
+    if bsdf.type != 'BSDF_PRINCIPLED':
+        return None
+
+    strength = bsdf.inputs["Emission Strength"]
+
+    if strength.is_linked:
+        return None
+
+    description = {
+        "albedo": describe_socket(bsdf.inputs["Base Color"]),
+        "rough": describe_socket(bsdf.inputs["Roughness"]),
+        "normal": describe_normal(bsdf.inputs["Normal"]),
+        "emission": describe_socket(bsdf.inputs["Emission Color"]),
+        "emission_strength": strength.default_value,
+    }
+
+    if any(source == None for source in description.values()):
+        return None
+
+    return description
+
+
+def loop_materials(mesh):
+    loop_count = len(mesh.loops)
+    polygon_count = len(mesh.polygons)
+
+    indices = read(mesh.polygons, "material_index", polygon_count, 1, numpy.int32)
+    totals = read(mesh.polygons, "loop_total", polygon_count, 1, numpy.int32)
+    per_loop = numpy.repeat(indices, totals)
+
+    uvs = read(mesh.uv_layers.active.data, "uv", loop_count, 2, numpy.float32)
+
+    return per_loop, uvs
+
+
+def region_gap(size, sizes):
+    # Widened so that the smallest channel still keeps a full padding between regions.
+    if len(sizes) == 0:
+        return padding
+
+    return min(padding * max(1, math.ceil(size / min(sizes))), size // 2)
+
+
+def grid_fits(count, size, gap):
+    cell = 1 + gap * 2
+
+    return (size // cell) * (size // cell) >= count
+
+
+def can_atlas(objects, texture_toggles, size):
+    if texture_toggles.ao_toggle:
+        return False
+
+    sizes = [channel_size(texture_toggles, channel, size)
+             for channel in backgrounds if getattr(texture_toggles, channel + "_toggle")]
+    gap = region_gap(size, sizes)
+    materials = set()
+
+    for object in objects:
+        if object.type != "MESH":
+            continue
+
+        mesh = object.data
+
+        if mesh.uv_layers.active == None:
+            return False
+
+        per_loop, uvs = loop_materials(mesh)
+
+        for i, slot in enumerate(object.material_slots):
+            if describe(slot.material) == None:
+                return False
+
+            selected = uvs[per_loop == i]
+
+            if len(selected) > 0 and (selected.min() < -bounds_epsilon or selected.max() > 1.00 + bounds_epsilon):
+                return False
+
+            materials.add(slot.material)
+
+    if len(materials) == 0 or not grid_fits(len(materials), size, gap):
+        return False
+
+    return layout(list(materials), size, gap) != None
+
+
+def source_size(description):
+    width = constant_size
+    height = constant_size
+
+    for channel in ["albedo", "rough", "normal", "emission"]:
+        if description[channel][0] == "image":
+            image = description[channel][1]
+            width = max(width, image.size[0])
+            height = max(height, image.size[1])
+
+    return width, height
+
+
+def shelf(sizes, size, gap):
+    order = sorted(range(0, len(sizes)), key=lambda i: -sizes[i][1])
+    regions = [None] * len(sizes)
+
+    x = 0
+    y = 0
+    shelf_height = 0
+
+    for i in order:
+        width = sizes[i][0] + gap * 2
+        height = sizes[i][1] + gap * 2
+
+        if x + width > size:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+
+        if x + width > size or y + height > size:
+            return None
+
+        regions[i] = (x + gap, y + gap, sizes[i][0], sizes[i][1])
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    return regions
+
+
+def pack(sizes, size, gap):
+    area = sum((width + gap * 2) * (height + gap * 2) for width, height in sizes)
+    scale = min(1.00, math.sqrt(size * size / area))
+
+    while True:
+        scaled = [(max(1, int(width * scale)), max(1, int(height * scale)))
+                  for width, height in sizes]
+        regions = shelf(scaled, size, gap)
+
+        if regions != None:
+            return regions
+
+        if all(width == 1 and height == 1 for width, height in scaled):
+            return None
+
+        scale *= 0.90
+
+
+def layout(materials, size, gap):
+    # Packed in name order, so the merged meshes get the layout that was checked on their sources.
+    materials = sorted(materials, key=lambda material: material.name)
+    regions = pack([source_size(describe(material)) for material in materials], size, gap)
+
+    if regions == None:
+        return None
+
+    return {material: region for material, region in zip(materials, regions)}
+
+
+def is_encoded(image):
+    return not image.is_float and image.colorspace_settings.name == 'sRGB'
+
+
+def source_pixels(source):
+    if source[0] == "value":
+        return numpy.array(source[1], numpy.float32).reshape(1, 1, 4)
+
+    image = source[1]
+    pixels = read_pixels(image)
+
+    if is_encoded(image):
+        pixels = srgb_to_linear(pixels)
+
+    if source[2] == "Alpha":
+        pixels = numpy.repeat(pixels[:, :, 3:4], 4, axis=2)
+        pixels[:, :, 3] = 1.00
+
+    return pixels
+
+
+def resample(pixels, width, height):
+    source_height, source_width = pixels.shape[:2]
+
+    xs = (numpy.arange(-padding, width + padding) + 0.50) * source_width / width
+    ys = (numpy.arange(-padding, height + padding) + 0.50) * source_height / height
+
+    xs = numpy.clip(xs.astype(numpy.int32), 0, source_width - 1)
+    ys = numpy.clip(ys.astype(numpy.int32), 0, source_height - 1)
+
+    return pixels[ys][:, xs]
+
+
+def scale_region(region, scale):
+    x, y, width, height = region
+    left = int(round(x * scale))
+    top = int(round(y * scale))
+
+    return (left, top, max(1, int(round((x + width) * scale)) - left), max(1, int(round((y + height) * scale)) - top))
+
+
+def paste(atlas, block, x, y):
+    height, width = atlas.shape[:2]
+    left = x - padding
+    top = y - padding
+
+    clip_left = max(0, -left)
+    clip_top = max(0, -top)
+    right = min(width, left + block.shape[1])
+    bottom = min(height, top + block.shape[0])
+
+    atlas[top + clip_top:bottom, left + clip_left:right] = \
+        block[clip_top:bottom - top, clip_left:right - left]
+
+
+def target_image(name, size):
+    image = bpy.data.images.get(name)
+
+    if image != None and not image.has_data:
+        bpy.data.images.remove(image)
+        image = None
+
+    if image == None:
+        image = bpy.data.images.new(name, size, size)
+
+        if "normal" in name or "rough" in name or "mask" in name:
+            image.colorspace_settings.name = 'Non-Color'
+
+        image.use_fake_user = True
+    elif image.size[0] != size or image.size[1] != size:
+        image.scale(size, size)
+
+    return image
+
+
+def build(prefix, objects, channels, size, sizes, material_count):
+    materials = []
+
+    for object in objects:
+        for slot in object.material_slots:
+            if slot.material not in materials:
+                materials.append(slot.material)
+
+    descriptions = [describe(material) for material in materials]
+    regions = layout(materials, size, region_gap(size, sizes))
+
+    if regions == None:
+        return False
+
+    regions = [regions[material] for material in materials]
+    divisor = max(material_count - 1, 1)
+
+    for channel, channel_size in zip(channels, sizes):
+        image = target_image(prefix + "." + channel, channel_size)
+        atlas = numpy.empty((channel_size, channel_size, 4), numpy.float32)
+        atlas[:, :] = backgrounds[channel]
+
+        for i, region in enumerate(regions):
+            x, y, width, height = scale_region(region, channel_size / size)
+            description = descriptions[i]
+
+            if channel == "mask":
+                source = ("value", (i / divisor, 0.00, 0.00, 1.00))
+            else:
+                source = description[channel]
+
+            pixels = source_pixels(source)
+
+            if channel == "emission":
+                pixels[:, :, :3] *= description["emission_strength"]
+
+            paste(atlas, resample(pixels, width, height), x, y)
+
+        if is_encoded(image):
+            atlas = linear_to_srgb(atlas)
+
+        write_pixels(image, atlas)
+        image.update()
+
+    for object in objects:
+        remap(object, materials, regions, size)
+
+    return True
+
+
+def remap(object, materials, regions, size):
+    mesh = object.data
+    per_loop, uvs = loop_materials(mesh)
+
+    offsets = numpy.zeros((max(len(object.material_slots), 1), 2), numpy.float32)
+    scales = numpy.ones((max(len(object.material_slots), 1), 2), numpy.float32)
+
+    for i, slot in enumerate(object.material_slots):
+        x, y, width, height = regions[materials.index(slot.material)]
+        offsets[i] = (x / size, y / size)
+        scales[i] = (width / size, height / size)
+
+    per_loop = numpy.clip(per_loop, 0, len(offsets) - 1)
+    uvs = offsets[per_loop] + numpy.clip(uvs, 0.00, 1.00) * scales[per_loop]
+
+    mesh.uv_layers.active.data.foreach_set("uv", uvs.ravel())
@@ -0,0 +1,167 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+import bpy
+
+from . import textures
+from .fingerprint import hash_mesh, hash_node_tree, hash_properties, hash_value
+
+version = 1
+
+
+def directory():
+    try:
+        return bpy.utils.extension_path_user(__package__.rsplit(".", 1)[0], path="bake_cache", create=True)
+    except (ValueError, AttributeError, RuntimeError):
+        path = os.path.join(tempfile.gettempdir(), "mergeexporter_bake_cache")
+        os.makedirs(path, exist_ok=True)
+
+        return path
+
+
+def compute_key(context, objects, channels, sizes):
+    digest = hashlib.sha256()
+    scene = context.scene
+    depsgraph = context.evaluated_depsgraph_get()
+    hashed = set()
+
+    hash_value(digest, (version, sizes, channels,
+               scene.merge_exporter_settings.material_count,
+               scene.merge_exporter_settings.mask_rasterize,
+               scene.merge_exporter_settings.isolated_bake,
+               scene.merge_exporter_settings.ao_occluders))
+    hash_properties(digest, scene.render.bake)
+
+    if scene.merge_exporter_settings.use_bake_profiles:
+        for channel in channels:
+            hash_properties(digest, getattr(
+                scene.merge_exporter_settings.bake_profiles, channel))
+
+    if hasattr(scene, "cycles"):
+        hash_value(digest, (scene.cycles.samples, scene.cycles.use_denoising))
+
+    for object in sorted(objects, key=lambda object: object.name):
+        if object.type != "MESH":
+            continue
+
+        hash_value(digest, (object.name, object.matrix_world))
+
+        evaluated = object.evaluated_get(depsgraph)
+        hash_mesh(digest, evaluated.to_mesh())
+        evaluated.to_mesh_clear()
+
+        for slot in object.material_slots:
+            material = slot.material
+            hash_value(digest, material)
+
+            if material == None or material.name_full in hashed:
+                continue
+
+            hashed.add(material.name_full)
+
+            if material.use_nodes:
+                hash_node_tree(digest, material.node_tree, set())
+
+    return digest.hexdigest()
+
+
+def entry_path(key):
+    return os.path.join(directory(), key)
+
+
+def read_entry(path, images):
+    entries = []
+
+    for channel, image in images:
+        with open(os.path.join(path, channel + ".png"), "rb") as file:
+            pixels = textures.decode_png(file.read())
+
+        if pixels.shape[1] != image.size[0] or pixels.shape[0] != image.size[1]:
+            raise ValueError("cached " + channel + " has a different size")
+
+        entries.append((image, pixels))
+
+    return entries
+
+
+def load(key, images):
+    path = entry_path(key)
+
+    for channel, image in images:
+        if not os.path.isfile(os.path.join(path, channel + ".png")):
+            return False
+
+    # Entries can be left truncated by a crashed worker, so everything is checked before any image is touched.
+    try:
+        entries = read_entry(path, images)
+    except (zlib.error, struct.error, ValueError, TypeError, KeyError, OSError):
+        shutil.rmtree(path, ignore_errors=True)
+        return False
+
+    for image, pixels in entries:
+        textures.write_pixels(image, textures.dequantize(pixels))
+
+    os.utime(path)
+
+    return True
+
+
+def store(key, images, limit):
+    path = entry_path(key)
+    os.makedirs(path, exist_ok=True)
+
+    for channel, image in images:
+        depth = 16 if image.is_float else 8
+        pixels = textures.quantize(textures.read_pixels(image), depth)
+
+        textures.write_file(os.path.join(
+            path, channel + ".png"), textures.encode_png(pixels, 1))
+
+    evict(limit, key)
+
+
+def entry_size(path):
+    size = 0
+
+    for name in os.listdir(path):
+        size += os.path.getsize(os.path.join(path, name))
+
+    return size
+
+
+def evict(limit, keep):
+    root = directory()
+    entries = []
+    total = 0
+
+    for key in os.listdir(root):
+        path = os.path.join(root, key)
+
+        if not os.path.isdir(path):
+            continue
+
+        size = entry_size(path)
+        total += size
+        entries.append((os.path.getmtime(path), key, size))
+
+    entries.sort()
+
+    for mtime, key, size in entries:
+        if total <= limit:
+            break
+
+        if key == keep:
+            continue
+
+        shutil.rmtree(os.path.join(root, key), ignore_errors=True)
+        total -= size
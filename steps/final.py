@@ -5,15 +5,98 @@
 # See the LICENSE file in the top-level directory for details.
 
 import os
+import tempfile
+import time
 
 import bpy
 
 from mathutils import Matrix, Vector
 
-from .step import Step
+from . import merging
+from .step import Step, output_path
+
+
+def active_profile(settings):
+    if settings.use_active_profile and settings.export_profile_index < len(settings.export_profiles):
+        return settings.export_profiles[settings.export_profile_index]
+
+    return None
+
+
+def missing_profile(context, collection):
+    name = collection.merge_exporter_props.export_profile
+
+    return name != "" and name not in context.scene.merge_exporter_settings.export_profiles
+
+
+def export_profile(context, collection):
+    settings = context.scene.merge_exporter_settings
+    name = collection.merge_exporter_props.export_profile
+
+    if name != "" and name in settings.export_profiles:
+        return settings.export_profiles[name]
+
+    return active_profile(settings)
+
+
+def gltf_options(profile):
+    if profile == None:
+        return {}
+
+    options = {
+        "export_image_format": profile.image_format,
+        "export_image_quality": profile.image_quality,
+    }
+
+    if profile.compression == 'DRACO':
+        options.update({
+            "export_draco_mesh_compression_enable": True,
+            "export_draco_mesh_compression_level": profile.draco_level,
+            "export_draco_position_quantization": profile.position_bits,
+            "export_draco_normal_quantization": profile.normal_bits,
+            "export_draco_texcoord_quantization": profile.texcoord_bits,
+            "export_draco_color_quantization": profile.color_bits,
+            "export_draco_generic_quantization": profile.generic_bits,
+        })
+    elif profile.compression == 'QUANTIZE':
+        options.update({
+            "export_use_gltfpack": True,
+            "export_gltfpack_noq": False,
+            "export_gltfpack_vp": min(profile.position_bits, 16),
+            "export_gltfpack_vn": min(profile.normal_bits, 16),
+            "export_gltfpack_vt": min(profile.texcoord_bits, 16),
+            "export_gltfpack_vc": min(profile.color_bits, 16),
+        })
+
+    if profile.image_format == 'WEBP':
+        options["export_image_webp_fallback"] = profile.webp_fallback
+
+    if profile.skip_unused:
+        options.update({
+            "export_attributes": False,
+            "export_tangents": False,
+            "export_unused_images": False,
+            "export_unused_textures": False,
+            "export_vertex_color": 'MATERIAL',
+        })
+
+    properties = bpy.ops.export_scene.gltf.get_rna_type().properties
+
+    return {name: value for name, value in options.items() if name in properties}
+
+
+def directory_size(path):
+    size = 0
+
+    for name in os.listdir(path):
+        size += os.path.getsize(os.path.join(path, name))
+
+    return size
 
 
 class ReoriginStep(Step):
+    holds_result = True
+
     def __init__(self, previous):
         super().__init__(previous)
 
@@ -51,6 +134,8 @@ class ReoriginStep(Step):
 
 
 class ReparentStep(Step):
+    holds_result = True
+
     def __init__(self, previous):
         super().__init__(previous)
         self.original_parents = []
@@ -89,6 +174,8 @@ class ReparentStep(Step):
 
 
 class MergeMeshesStep(Step):
+    holds_result = True
+
     def __init__(self, previous):
         super().__init__(previous)
         self.to_delete = []
@@ -96,11 +183,21 @@ class MergeMeshesStep(Step):
         self.renamed_original_name = None
 
     def __enter__(self):
-        self.select(lambda object: object.type == "MESH")
+        mode = self.context.scene.merge_exporter_settings.merge_mode
+        meshes = [object for object in self.objects if object.type == "MESH"]
+
+        start = time.perf_counter()
 
-        if len(self.context.selected_objects) > 1:
-            bpy.ops.object.join()
+        if mode == "DIRECT" and len(meshes) > 1 and merging.can_merge(meshes):
+            self.select(None, [merging.merge(meshes)])
+        else:
+            mode = "JOIN"
+            self.select(lambda object: object.type == "MESH")
 
+            if len(self.context.selected_objects) > 1:
+                bpy.ops.object.join()
+
+        self.shared.add_timing("merge." + mode, time.perf_counter() - start)
         self.to_delete = self.gather()
 
         self.select_add(lambda object: object.type != "MESH")
@@ -111,8 +208,8 @@ class MergeMeshesStep(Step):
         if self.collection.merge_exporter_props.override_name:
             name = self.collection.merge_exporter_props.name
 
-        if name in bpy.context.scene.objects:
-            to_rename = bpy.context.scene.objects[name]
+        if name in bpy.data.objects:
+            to_rename = bpy.data.objects[name]
 
             self.renamed_object = to_rename
             self.renamed_original_name = to_rename.name
@@ -137,23 +234,22 @@ class MergeMeshesStep(Step):
 
 class ExportStep(Step):
     def __enter__(self):
-        format = self.context.scene.merge_exporter_settings.export_format
-        props = self.collection.merge_exporter_props
-        prefix = os.path.abspath(bpy.path.abspath(props.path)) + "/"
-        name = self.collection.name
+        settings = self.context.scene.merge_exporter_settings
+        format = settings.export_format
+        path = output_path(self.collection, "." + format)
+        profile = export_profile(self.context, self.collection)
 
-        if self.collection.merge_exporter_props.override_name:
-            name = self.collection.merge_exporter_props.name
-
-        path = prefix + name + "." + format
+        if missing_profile(self.context, self.collection):
+            self.shared.missing_profiles.append(
+                (self.collection.name, self.collection.merge_exporter_props.export_profile))
 
         self.select()
 
         if format == "gltf":
-            bpy.ops.export_scene.gltf(
-                filepath=path,
-                use_selection=True
-            )
+            self.export_gltf(path, profile)
+
+            if settings.compare_profiles:
+                self.compare(profile)
         else:
             bpy.ops.export_scene.fbx(
                 filepath=path,
@@ -161,7 +257,31 @@ class ExportStep(Step):
                 apply_scale_options="FBX_SCALE_ALL",
             )
 
+        self.shared.exported.append(path)
+
         return self
 
+    def export_gltf(self, path, profile):
+        bpy.ops.export_scene.gltf(
+            filepath=path,
+            use_selection=True,
+            use_active_scene=self.context.scene.merge_exporter_settings.scratch_scene,
+            **gltf_options(profile),
+        )
+
+    def compare(self, used):
+        profiles = [None] + list(self.context.scene.merge_exporter_settings.export_profiles)
+        sizes = []
+
+        for profile in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                self.export_gltf(os.path.join(
+                    directory, self.collection.name + ".gltf"), profile)
+
+                name = profile.name if profile != None else "Default"
+                sizes.append((name, directory_size(directory), profile == used))
+
+        self.shared.export_sizes[self.collection.name] = sizes
+
     def __exit__(self, *args):
         pass
@@ -0,0 +1,299 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import hashlib
+import json
+import os
+
+import bpy
+import numpy
+
+from .final import export_profile
+from .merging import read
+from .step import output_path
+from .textures import read_pixels
+
+version = 2
+manifest_suffix = ".manifest.json"
+
+ignored_settings = {
+    "collections",
+    "entities",
+    "entity_details",
+    "export_index",
+    "textures",
+    "object_details",
+    "object_index",
+    "pipeline",
+    "bake_details",
+    "incremental_export",
+    "profiles",
+    "export_profile_index",
+    "compare_profiles",
+    "parallel_export",
+    "parallel_workers",
+}
+
+ignored_node_properties = {
+    "location",
+    "location_absolute",
+    "dimensions",
+    "width",
+    "height",
+    "select",
+}
+
+ignored_modifier_properties = {
+    "show_expanded",
+    "is_active",
+}
+
+
+def plain(value):
+    if isinstance(value, str):
+        return value
+
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(plain(item) for item in value))
+
+    if hasattr(value, "__len__") and hasattr(value, "__iter__"):
+        return tuple(plain(item) for item in value)
+
+    return value
+
+
+def hash_value(digest, value):
+    digest.update(repr(plain(value)).encode())
+
+
+def hash_image(digest, identifier, image):
+    hash_value(digest, (identifier, image.name_full,
+               image.filepath, tuple(image.size)))
+
+    # Unsaved, packed and generated images have no file to compare against.
+    if image.is_dirty or image.packed_file != None or image.source != 'FILE':
+        if image.has_data:
+            digest.update(read_pixels(image).tobytes())
+
+        return
+
+    try:
+        hash_value(digest, os.stat(bpy.path.abspath(
+            image.filepath, library=image.library)).st_mtime_ns)
+    except OSError:
+        hash_value(digest, None)
+
+
+def hash_properties(digest, struct, ignored=()):
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+
+        if identifier == "rna_type" or identifier in ignored:
+            continue
+
+        if prop.type == "COLLECTION":
+            continue
+
+        value = getattr(struct, identifier, None)
+
+        if prop.type == "POINTER":
+            if isinstance(value, bpy.types.Image):
+                hash_image(digest, identifier, value)
+            elif isinstance(value, bpy.types.Object):
+                hash_value(digest, (identifier, value, value.matrix_world))
+            elif isinstance(value, bpy.types.ID) or value == None:
+                hash_value(digest, (identifier, value))
+            elif isinstance(value, bpy.types.PropertyGroup):
+                hash_properties(digest, value)
+
+            continue
+
+        hash_value(digest, (identifier, value))
+
+
+def hash_node_tree(digest, node_tree, seen):
+    if node_tree == None or node_tree.name_full in seen:
+        hash_value(digest, node_tree)
+        return
+
+    seen.add(node_tree.name_full)
+
+    for node in node_tree.nodes:
+        ignored = ignored_node_properties
+
+        if node.type == 'TEX_IMAGE' and not any(output.is_linked for output in node.outputs):
+            ignored = ignored | {"image"}
+
+        hash_value(digest, (node.bl_idname, node.name))
+        hash_properties(digest, node, ignored)
+
+        for socket in node.inputs:
+            if hasattr(socket, "default_value"):
+                hash_value(digest, (socket.identifier, socket.default_value))
+
+        if getattr(node, "node_tree", None) != None:
+            hash_node_tree(digest, node.node_tree, seen)
+
+    for link in node_tree.links:
+        hash_value(digest, (link.from_node.name, link.from_socket.identifier,
+                   link.to_node.name, link.to_socket.identifier))
+
+
+def hash_mesh(digest, mesh):
+    vertex_count = len(mesh.vertices)
+
+    digest.update(read(mesh.vertices, "co", vertex_count,
+                  3, numpy.float32).tobytes())
+    digest.update(read(mesh.edges, "vertices", len(
+        mesh.edges), 2, numpy.int32).tobytes())
+    digest.update(read(mesh.loops, "vertex_index", len(
+        mesh.loops), 1, numpy.int32).tobytes())
+    digest.update(read(mesh.polygons, "loop_start", len(
+        mesh.polygons), 1, numpy.int32).tobytes())
+    digest.update(read(mesh.polygons, "material_index", len(
+        mesh.polygons), 1, numpy.int32).tobytes())
+
+    for layer in mesh.uv_layers:
+        hash_value(digest, layer.name)
+        digest.update(read(layer.data, "uv", len(
+            mesh.loops), 2, numpy.float32).tobytes())
+
+    if mesh.shape_keys != None:
+        for block in mesh.shape_keys.key_blocks:
+            hash_value(digest, (block.name, block.value,
+                       block.slider_min, block.slider_max))
+            digest.update(read(block.data, "co", vertex_count,
+                          3, numpy.float32).tobytes())
+
+
+def hash_target(digest, object, hashed):
+    if ("object", object.name_full) in hashed:
+        return
+
+    hashed.add(("object", object.name_full))
+    hash_value(digest, (object.name, object.type, object.matrix_world))
+
+    if object.type == "MESH" and object.data.name_full not in hashed:
+        hashed.add(object.data.name_full)
+        hash_mesh(digest, object.data)
+    elif object.type == "ARMATURE" and object.pose != None:
+        for bone in object.pose.bones:
+            hash_value(digest, (bone.name, bone.matrix))
+
+
+def hash_object(digest, object, hashed):
+    hash_value(digest, (object.name, object.type,
+               object.matrix_world, object.parent))
+
+    for mod in object.modifiers:
+        hash_value(digest, (mod.type, mod.name))
+        hash_properties(digest, mod, ignored_modifier_properties)
+
+        for prop in mod.bl_rna.properties:
+            if prop.type == "POINTER" and isinstance(getattr(mod, prop.identifier, None), bpy.types.Object):
+                hash_target(digest, getattr(mod, prop.identifier), hashed)
+
+    if object.type != "MESH":
+        return
+
+    if object.data.name_full not in hashed:
+        hashed.add(object.data.name_full)
+        hash_mesh(digest, object.data)
+
+    hash_value(digest, object.data)
+
+    for slot in object.material_slots:
+        material = slot.material
+        hash_value(digest, material)
+
+        if material == None or material.name_full in hashed:
+            continue
+
+        hashed.add(material.name_full)
+
+        if material.use_nodes:
+            hash_node_tree(digest, material.node_tree, set())
+
+
+def compute(context, stack):
+    digest = hashlib.sha256()
+    scene = context.scene
+    hashed = set()
+
+    hash_value(digest, version)
+    hash_properties(digest, scene.merge_exporter_settings, ignored_settings)
+    hash_properties(digest, scene.render.bake)
+    hash_value(digest, scene.render.engine)
+
+    if hasattr(scene, "cycles"):
+        hash_value(digest, (scene.cycles.samples, scene.cycles.use_denoising))
+
+    profile = export_profile(context, stack[-1][0])
+
+    if profile != None:
+        hash_properties(digest, profile)
+
+    for entry in stack:
+        collection = entry[0]
+
+        hash_value(digest, collection.name)
+        hash_properties(digest, collection.merge_exporter_props)
+
+        for object in sorted(collection.objects, key=lambda object: object.name):
+            hash_object(digest, object, hashed)
+
+    return digest.hexdigest()
+
+
+def manifest_path(collection):
+    return output_path(collection, manifest_suffix)
+
+
+def describe_output(path):
+    stat = os.stat(path)
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def is_current(collection, fingerprint):
+    try:
+        with open(manifest_path(collection)) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return False
+
+    if manifest.get("fingerprint") != fingerprint:
+        return False
+
+    outputs = manifest.get("outputs", {})
+
+    if len(outputs) == 0:
+        return False
+
+    for path, description in outputs.items():
+        try:
+            if describe_output(path) != description:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def store(collection, fingerprint, outputs):
+    path = manifest_path(collection)
+    manifest = {
+        "fingerprint": fingerprint,
+        "outputs": {output: describe_output(output) for output in outputs if os.path.exists(output)},
+    }
+
+    with open(path + ".tmp", "w") as file:
+        json.dump(manifest, file, indent=4)
+
+    os.replace(path + ".tmp", path)
@@ -4,12 +4,18 @@
 # Licensed under the GNU General Public License v3.0 or later
 # See the LICENSE file in the top-level directory for details.
 
+import contextlib
 import os
+import time
 
 import bpy
-import numpy
 
-from .step import Step
+from . import atlas, packing
+from .preparations import UnhideStep
+from .step import Step, InitialStep
+from .textures import channel_size, create_writer
+
+channels = ["albedo", "normal", "rough", "mask", "emission", "ao"]
 
 
 class BakeStep(Step):
@@ -18,9 +24,139 @@ class BakeStep(Step):
         if not props.bake:
             return self
 
+        if self.collection.name in self.shared.baked or self.collection.name in self.shared.atlased:
+            return self
+
+        if props.bake_method == "ATLAS":
+            texture_toggles = self.context.scene.merge_exporter_settings.texture_toggles
+
+            if atlas.can_atlas(self.objects, texture_toggles, props.texture_size):
+                self.shared.atlased.add(self.collection.name)
+                return self
+
+        start = time.perf_counter()
+        self.select(lambda object: object.type == "MESH")
+        bpy.ops.collection.merge_export_bake(
+            prefix=self.collection.name, size=props.texture_size)
+        self.shared.add_timing("bake.CYCLES", time.perf_counter() - start)
+
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def collection_materials(collection):
+    materials = set()
+
+    for object in collection.objects:
+        if object.type != "MESH":
+            continue
+
+        for slot in object.material_slots:
+            if slot.material != None:
+                materials.add(slot.material)
+
+    return materials
+
+
+def batch_bake(context, stack, shared):
+    settings = context.scene.merge_exporter_settings
+
+    if settings.texture_toggles.mask_toggle and not settings.mask_rasterize:
+        return
+
+    candidates = []
+
+    for entry in stack:
+        collection = entry[0]
+        props = collection.merge_exporter_props
+
+        if not props.bake:
+            continue
+
+        if props.bake_method == "ATLAS" and atlas.can_atlas(
+                collection.objects, settings.texture_toggles, props.texture_size):
+            shared.atlased.add(collection.name)
+            continue
+
+        candidates.append(collection)
+
+    users = {}
+
+    for collection in candidates:
+        for material in collection_materials(collection):
+            users.setdefault(material, set()).add(collection.name)
+
+    conflicted = set()
+
+    for names in users.values():
+        if len(names) > 1:
+            conflicted.update(names)
+
+    batch = [collection for collection in candidates if collection.name not in conflicted]
+
+    if len(batch) < 2:
+        return
+
+    with contextlib.ExitStack() as exit_stack:
+        objects = []
+
+        for collection in batch:
+            s = exit_stack.enter_context(UnhideStep(InitialStep(
+                context, collection, collection, shared, list(collection.objects))))
+            objects.extend(object for object in collection.objects if object.type == "MESH")
+
+        start = time.perf_counter()
+        s.select(None, objects)
+        bpy.ops.collection.merge_export_bake(
+            batch="\n".join(collection.name for collection in batch))
+        shared.add_timing("bake.CYCLES", time.perf_counter() - start)
+
+    shared.baked.update(collection.name for collection in batch)
+
+
+class AtlasStep(Step):
+    def __enter__(self):
+        if self.collection.name not in self.shared.atlased:
+            return self
+
+        settings = self.context.scene.merge_exporter_settings
+        props = self.collection.merge_exporter_props
+        enabled = [channel for channel in channels if getattr(
+            settings.texture_toggles, channel + "_toggle")]
+        sizes = [channel_size(settings.texture_toggles, channel, props.texture_size)
+                 for channel in enabled]
+
+        start = time.perf_counter()
+
+        if atlas.build(self.collection.name, [object for object in self.objects if object.type == "MESH"],
+                       enabled, props.texture_size, sizes, settings.material_count):
+            self.shared.add_timing("bake.ATLAS", time.perf_counter() - start)
+            return self
+
         self.select(lambda object: object.type == "MESH")
         bpy.ops.collection.merge_export_bake(
             prefix=self.collection.name, size=props.texture_size)
+        self.shared.add_timing("bake.CYCLES", time.perf_counter() - start)
+
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class PackChannelsStep(Step):
+    def __enter__(self):
+        settings = self.context.scene.merge_exporter_settings
+        props = self.collection.merge_exporter_props
+
+        if not props.bake or len(packing.packed_channels(settings)) == 0:
+            return self
+
+        start = time.perf_counter()
+        packing.pack(self.collection.name, settings, props.texture_size)
+        self.shared.add_timing("bake.PACK", time.perf_counter() - start)
 
         return self
 
@@ -39,56 +175,65 @@ class SaveTexturesStep(Step):
         props = self.root.merge_exporter_props
         prefix = os.path.abspath(bpy.path.abspath(props.path)) + "/"
 
+        if self.shared.texture_writer == None:
+            self.shared.texture_writer = create_writer(
+                self.context.scene.merge_exporter_settings)
+
+        writer = self.shared.texture_writer
+        writer.begin()
+
+        for channel in channels + ["packed"]:
+            image = bpy.data.images.get(self.collection.name + "." + channel)
+
+            if image != None:
+                writer.track(image)
+
         for object in self.objects:
             if object.type != "MESH":
                 continue
 
             self.save_textures(self.collection.name, prefix)
 
+        self.shared.memory_peaks[self.collection.name] = writer.peak_bytes
+
         return self
 
     def __exit__(self, *args):
         pass
 
     def save_textures(self, name, path_prefix):
-        format = "." + bpy.context.scene.merge_exporter_settings.export_texture_format
-        texture_toggles = bpy.context.scene.merge_exporter_settings.texture_toggles
-
-        if texture_toggles.albedo_toggle:
-            self.save_image(name + ".albedo", path_prefix +
-                            name + ".albedo" + format)
-
-        if texture_toggles.normal_toggle:
-            self.save_image(name + ".normal", path_prefix +
-                            name + ".normal" + format)
-
-        if texture_toggles.rough_toggle:
-            self.save_image(name + ".rough", path_prefix +
-                            name + ".rough" + format)
-
-        if texture_toggles.mask_toggle:
-            self.save_image(name + ".mask", path_prefix +
-                            name + ".mask" + format)
-
-        if texture_toggles.emission_toggle:
-            self.save_image(name + ".emission", path_prefix +
-                            name + ".emission" + format)
-
-        if texture_toggles.ao_toggle:
-            self.save_image(name + ".ao", path_prefix + name + ".ao" + format)
+        settings = bpy.context.scene.merge_exporter_settings
+        format = "." + settings.export_texture_format
+        texture_toggles = settings.texture_toggles
+        size = self.collection.merge_exporter_props.texture_size
+        packed = packing.packed_channels(settings)
+
+        if len(packed) > 0:
+            self.save_image(name + ".packed", path_prefix + name + ".packed" + format,
+                            packing.packed_size(settings, size))
+
+        for channel in channels:
+            if getattr(texture_toggles, channel + "_toggle") and channel not in packed:
+                self.save_image(name + "." + channel, path_prefix + name + "." + channel + format,
+                                channel_size(texture_toggles, channel, size))
+
+    def save_image(self, name, destination, size):
+        writer = self.shared.texture_writer
+        image = bpy.data.images.get(name)
+
+        if image == None:
+            return
 
-    def save_image(self, name, destination):
-        original = bpy.data.images.get(name)
-        copy = original.copy()
-        copy.scale(original.size[0], original.size[1])
+        if image.size[0] != size or image.size[1] != size:
+            image.scale(size, size)
 
-        tmp_buf = numpy.empty(
-            original.size[0] * original.size[1] * 4, numpy.float32)
-        original.pixels.foreach_get(tmp_buf)
-        copy.pixels.foreach_set(tmp_buf)
+        writer.submit(image, destination)
+        self.shared.exported.append(destination)
 
-        copy.save(filepath=destination)
-        bpy.data.images.remove(copy)
+        # The packed image is still used by the merged material until the export.
+        if writer.budget != None and image.users <= int(image.use_fake_user):
+            writer.untrack(name)
+            bpy.data.images.remove(image)
 
 
 class MaterializeStep(Step):
@@ -114,7 +259,9 @@ class MaterializeStep(Step):
         name = self.collection.name
 
         material_name = name + ".merged"
-        texture_toggles = bpy.context.scene.merge_exporter_settings.texture_toggles
+        settings = bpy.context.scene.merge_exporter_settings
+        texture_toggles = settings.texture_toggles
+        packed = packing.packed_channels(settings)
 
         if object.data.name in self.shared.encountered_materials:
             object.data.materials.clear()
@@ -158,16 +305,53 @@ class MaterializeStep(Step):
                 node_normal_image.outputs[0], node_normalmap.inputs[1])
             node_tree.links.new(node_normalmap.outputs[0], node_bsdf.inputs[5])
 
-        if texture_toggles.rough_toggle:
+        if texture_toggles.rough_toggle and not "rough" in packed:
             node_rough_image = node_tree.nodes.new(type='ShaderNodeTexImage')
             node_rough_image.location = (160, -810)
             # node_rough_image.image = bpy.data.images.get(name + ".rough")
             node_tree.links.new(
                 node_rough_image.outputs[0], node_bsdf.inputs[2])
 
+        if "rough" in packed or "ao" in packed:
+            node_packed_image = node_tree.nodes.new(type='ShaderNodeTexImage')
+            node_packed_image.location = (-160, -810)
+            node_packed_image.image = bpy.data.images.get(name + ".packed")
+
+            node_separate = node_tree.nodes.new(type='ShaderNodeSeparateColor')
+            node_separate.location = (160, -810)
+            node_tree.links.new(
+                node_packed_image.outputs[0], node_separate.inputs[0])
+
+            outputs = list(node_separate.outputs) + [node_packed_image.outputs[1]]
+            layout = packing.layout(settings)
+
+            if "rough" in packed:
+                node_tree.links.new(
+                    outputs[layout.index("rough")], node_bsdf.inputs[2])
+
+            if "ao" in packed:
+                node_occlusion = node_tree.nodes.new(type='ShaderNodeGroup')
+                node_occlusion.location = (480, -810)
+                node_occlusion.node_tree = gltf_output_group()
+                node_tree.links.new(
+                    outputs[layout.index("ao")], node_occlusion.inputs[0])
+
         node_tree.links.new(node_bsdf.outputs[0], node_output.inputs[0])
 
         self.shared.encountered_materials[object.data.name] = mat
 
         object.data.materials.clear()
         object.data.materials.append(mat)
+
+
+def gltf_output_group():
+    # The glTF exporter reads the occlusion texture from a group with this name.
+    group = bpy.data.node_groups.get("glTF Material Output")
+
+    if group == None:
+        group = bpy.data.node_groups.new(
+            "glTF Material Output", 'ShaderNodeTree')
+        group.interface.new_socket(
+            "Occlusion", in_out='INPUT', socket_type='NodeSocketFloat')
+
+    return group
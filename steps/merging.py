@@ -0,0 +1,306 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import bpy
+import numpy
+
+attribute_types = {
+    "FLOAT": ("value", 1, numpy.float32),
+    "INT": ("value", 1, numpy.int32),
+    "INT8": ("value", 1, numpy.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, numpy.float32),
+    "FLOAT_VECTOR": ("vector", 3, numpy.float32),
+    "INT32_2D": ("value", 2, numpy.int32),
+    "FLOAT_COLOR": ("color", 4, numpy.float32),
+    "BYTE_COLOR": ("color", 4, numpy.float32),
+    "QUATERNION": ("value", 4, numpy.float32),
+    "FLOAT4X4": ("value", 16, numpy.float32),
+}
+
+skipped_attributes = {"position", "material_index"}
+
+
+def read(collection, attribute, count, size, dtype):
+    buffer = numpy.empty(count * size, dtype)
+    collection.foreach_get(attribute, buffer)
+
+    if size == 1:
+        return buffer
+
+    return buffer.reshape(-1, size)
+
+
+def domain_size(mesh, domain):
+    if domain == "POINT":
+        return len(mesh.vertices)
+
+    if domain == "EDGE":
+        return len(mesh.edges)
+
+    if domain == "FACE":
+        return len(mesh.polygons)
+
+    return len(mesh.loops)
+
+
+def relative_matrix(root, object):
+    return numpy.array(root.matrix_world.inverted() @ object.matrix_world, numpy.float32)
+
+
+def can_merge(objects):
+    root = objects[0]
+
+    for object in objects:
+        if len(object.vertex_groups) > 0:
+            return False
+
+        matrix = root.matrix_world.inverted() @ object.matrix_world
+
+        if matrix.determinant() <= 0.00:
+            return False
+
+    return True
+
+
+def transform_points(points, matrix):
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def transform_normals(normals, matrix):
+    normals = normals @ numpy.linalg.inv(matrix[:3, :3])
+    lengths = numpy.linalg.norm(normals, axis=1)
+    lengths[lengths == 0.00] = 1.00
+
+    return normals / lengths[:, None]
+
+
+def gather_layout(objects):
+    materials = []
+    uv_names = []
+    attributes = {}
+    key_blocks = []
+    custom_normals = False
+
+    for object in objects:
+        mesh = object.data
+
+        for slot in object.material_slots:
+            if slot.material not in materials:
+                materials.append(slot.material)
+
+        for layer in mesh.uv_layers:
+            if layer.name not in uv_names:
+                uv_names.append(layer.name)
+
+        for attribute in mesh.attributes:
+            if attribute.name.startswith("."):
+                continue
+
+            if attribute.name in skipped_attributes or attribute.name in mesh.uv_layers:
+                continue
+
+            if attribute.data_type not in attribute_types:
+                continue
+
+            layout = (attribute.domain, attribute.data_type)
+
+            if attributes.setdefault(attribute.name, layout) != layout:
+                attributes[attribute.name] = None
+
+        if mesh.shape_keys != None:
+            names = [block.name for block in key_blocks]
+
+            for i, block in enumerate(mesh.shape_keys.key_blocks):
+                if len(key_blocks) == 0 or (i > 0 and block.name not in names):
+                    key_blocks.append(block)
+
+        custom_normals = custom_normals or mesh.has_custom_normals
+
+    attributes = {name: layout for name,
+                  layout in attributes.items() if layout != None}
+
+    return materials, uv_names, attributes, key_blocks, custom_normals
+
+
+def merge(objects):
+    root = objects[0]
+    materials, uv_names, attributes, key_blocks, custom_normals = gather_layout(
+        objects)
+    relative_keys = [block.relative_key.name for block in key_blocks]
+
+    positions = []
+    edges = []
+    seams = []
+    corner_verts = []
+    corner_edges = []
+    loop_starts = []
+    material_indices = []
+    normals = []
+    uvs = {name: [] for name in uv_names}
+    values = {name: [] for name in attributes}
+    keys = [[] for block in key_blocks]
+
+    vertex_offset = 0
+    edge_offset = 0
+    loop_offset = 0
+
+    for object in objects:
+        mesh = object.data
+        matrix = relative_matrix(root, object)
+
+        vertex_count = len(mesh.vertices)
+        edge_count = len(mesh.edges)
+        loop_count = len(mesh.loops)
+        polygon_count = len(mesh.polygons)
+
+        co = transform_points(
+            read(mesh.vertices, "co", vertex_count, 3, numpy.float32), matrix)
+        positions.append(co)
+
+        edges.append(read(mesh.edges, "vertices", edge_count,
+                     2, numpy.int32) + vertex_offset)
+        seams.append(read(mesh.edges, "use_seam", edge_count, 1, bool))
+
+        corner_verts.append(
+            read(mesh.loops, "vertex_index", loop_count, 1, numpy.int32) + vertex_offset)
+        corner_edges.append(
+            read(mesh.loops, "edge_index", loop_count, 1, numpy.int32) + edge_offset)
+
+        loop_starts.append(
+            read(mesh.polygons, "loop_start", polygon_count, 1, numpy.int32) + loop_offset)
+
+        slots = [materials.index(slot.material)
+                 for slot in object.material_slots]
+
+        if len(slots) == 0:
+            slots = [0]
+
+        indices = read(mesh.polygons, "material_index",
+                       polygon_count, 1, numpy.int32)
+        indices = numpy.clip(indices, 0, len(slots) - 1)
+        material_indices.append(numpy.array(slots, numpy.int32)[indices])
+
+        if custom_normals:
+            normals.append(transform_normals(
+                read(mesh.corner_normals, "vector", loop_count, 3, numpy.float32), matrix))
+
+        for name in uv_names:
+            if name in mesh.uv_layers:
+                uvs[name].append(
+                    read(mesh.uv_layers[name].data, "uv", loop_count, 2, numpy.float32))
+            else:
+                uvs[name].append(numpy.zeros((loop_count, 2), numpy.float32))
+
+        for name, layout in attributes.items():
+            key, size, dtype = attribute_types[layout[1]]
+            count = domain_size(mesh, layout[0])
+            attribute = mesh.attributes.get(name)
+
+            if attribute != None and (attribute.domain, attribute.data_type) == layout:
+                values[name].append(
+                    read(attribute.data, key, count, size, dtype))
+            else:
+                values[name].append(numpy.zeros(
+                    count if size == 1 else (count, size), dtype))
+
+        if len(key_blocks) > 0:
+            own_blocks = None
+
+            if mesh.shape_keys != None:
+                own_blocks = mesh.shape_keys.key_blocks
+
+            basis = co
+
+            if own_blocks != None and len(own_blocks) > 0:
+                basis = transform_points(
+                    read(own_blocks[0].data, "co", vertex_count, 3, numpy.float32), matrix)
+
+            keys[0].append(basis)
+
+            for i, block in enumerate(key_blocks[1:], 1):
+                if own_blocks != None and block.name in own_blocks and own_blocks[block.name] != own_blocks[0]:
+                    keys[i].append(transform_points(
+                        read(own_blocks[block.name].data, "co", vertex_count, 3, numpy.float32), matrix))
+                else:
+                    keys[i].append(basis)
+
+        vertex_offset += vertex_count
+        edge_offset += edge_count
+        loop_offset += loop_count
+
+    merged = bpy.data.meshes.new(root.data.name)
+
+    merged.vertices.add(vertex_offset)
+    merged.vertices.foreach_set("co", numpy.concatenate(positions).ravel())
+
+    merged.edges.add(edge_offset)
+    merged.edges.foreach_set("vertices", numpy.concatenate(edges).ravel())
+    merged.edges.foreach_set("use_seam", numpy.concatenate(seams))
+
+    merged.loops.add(loop_offset)
+    merged.loops.foreach_set("vertex_index", numpy.concatenate(corner_verts))
+    merged.loops.foreach_set("edge_index", numpy.concatenate(corner_edges))
+
+    merged.polygons.add(sum(len(starts) for starts in loop_starts))
+    merged.polygons.foreach_set("loop_start", numpy.concatenate(loop_starts))
+    merged.polygons.foreach_set(
+        "material_index", numpy.concatenate(material_indices))
+
+    for name in uv_names:
+        layer = merged.uv_layers.new(name=name)
+        layer.data.foreach_set("uv", numpy.concatenate(uvs[name]).ravel())
+
+    if root.data.uv_layers.active != None:
+        merged.uv_layers.active = merged.uv_layers[root.data.uv_layers.active.name]
+
+    for layer in root.data.uv_layers:
+        if layer.active_render:
+            merged.uv_layers[layer.name].active_render = True
+
+    for name, layout in attributes.items():
+        key = attribute_types[layout[1]][0]
+        attribute = merged.attributes.get(name)
+
+        if attribute == None:
+            attribute = merged.attributes.new(name, layout[1], layout[0])
+
+        attribute.data.foreach_set(
+            key, numpy.concatenate(values[name]).ravel())
+
+    for material in materials:
+        merged.materials.append(material)
+
+    merged.update()
+
+    if custom_normals:
+        merged.normals_split_custom_set(numpy.concatenate(normals))
+
+    root.data = merged
+
+    if len(key_blocks) > 0:
+        for i, block in enumerate(key_blocks):
+            merged_block = root.shape_key_add(name=block.name, from_mix=False)
+            merged_block.data.foreach_set(
+                "co", numpy.concatenate(keys[i]).ravel())
+
+            if i == 0:
+                continue
+
+            merged_block.slider_min = block.slider_min
+            merged_block.slider_max = block.slider_max
+            merged_block.value = block.value
+
+        merged_blocks = root.data.shape_keys.key_blocks
+
+        for i, name in enumerate(relative_keys):
+            if i > 0 and name in merged_blocks:
+                merged_blocks[i].relative_key = merged_blocks[name]
+
+    for object in objects[1:]:
+        bpy.data.objects.remove(object)
+
+    return root
@@ -4,7 +4,12 @@
 # Licensed under the GNU General Public License v3.0 or later
 # See the LICENSE file in the top-level directory for details.
 
+import time
+
 import bpy
+import numpy
+
+from mathutils import kdtree
 
 from .step import Step
 
@@ -21,6 +26,9 @@ class CopyShapeKeysStep(Step):
             if len(source.data.shape_keys.key_blocks) == 0:
                 continue
 
+            if len(source.data.vertices) == 0:
+                continue
+
             if destination.data.shape_keys == None:
                 src_name = source.data.shape_keys.key_blocks[0].name
                 destination.shape_key_add(name=src_name)
@@ -33,40 +41,41 @@ class CopyShapeKeysStep(Step):
     def __exit__(self, *args):
         pass
 
-    def get_distance_squared(self, a, b):
-        return (a - b).length_squared
+    def read_coordinates(self, block):
+        coordinates = numpy.empty(len(block.data) * 3, numpy.float32)
+        block.data.foreach_get("co", coordinates)
 
-    def find_nearest_point_index(self, point, point_list):
-        co = point.co
-        nearest_dist = self.get_distance_squared(co, point_list[0].co)
-        nearest_index = 0
-        index = 0
+        return coordinates.reshape(-1, 3)
 
-        for list_point in point_list:
-            dist = self.get_distance_squared(co, list_point.co)
+    def map_indices(self, source, destination):
+        src_co = self.read_coordinates(source.data.shape_keys.key_blocks[0])
+        dst_co = self.read_coordinates(
+            destination.data.shape_keys.key_blocks[0])
 
-            if dist < nearest_dist:
-                nearest_dist = dist
-                nearest_index = index
+        if len(src_co) == len(dst_co) and numpy.allclose(src_co, dst_co):
+            return None
 
-            index = index + 1
+        tree = kdtree.KDTree(len(src_co))
 
-        return nearest_index
+        for i, co in enumerate(src_co):
+            tree.insert(co, i)
 
-    def map_indices(self, source, destination):
-        src_basis = source.data.shape_keys.key_blocks[0]
-        dst_basis = destination.data.shape_keys.key_blocks[0]
-        indices = []
+        tree.balance()
+
+        indices = numpy.empty(len(dst_co), numpy.int64)
 
-        for dst_point in dst_basis.data:
-            index = self.find_nearest_point_index(dst_point, src_basis.data)
-            indices.append(index)
+        for i, co in enumerate(dst_co):
+            indices[i] = tree.find(co)[1]
 
         return indices
 
     def copy_shapekey_block(self, src_block, dst_block, map):
-        for i in range(0, len(dst_block.data)):
-            dst_block.data[i].co = src_block.data[map[i]].co
+        co = self.read_coordinates(src_block)
+
+        if map is not None:
+            co = co[map]
+
+        dst_block.data.foreach_set("co", co.ravel())
 
     def copy_shapekeys(self, source, destination, map):
         src_blocks = source.data.shape_keys.key_blocks
@@ -112,6 +121,30 @@ class DeleteShapeKeysStep(Step):
 
 class ApplyModifiersStep(Step):
     def __enter__(self):
+        mode = self.context.scene.merge_exporter_settings.modifier_mode
+        start = time.perf_counter()
+
+        if mode == "EVALUATE":
+            self.apply_evaluated()
+        else:
+            self.apply_operator()
+
+        self.shared.add_timing("modifiers." + mode,
+                               time.perf_counter() - start)
+
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def has_mirror(self, object):
+        for mod in object.modifiers:
+            if type(mod) is bpy.types.MirrorModifier:
+                return True
+
+        return False
+
+    def apply_operator(self):
         for object in self.objects:
             if object.type != "MESH":
                 continue
@@ -119,10 +152,7 @@ class ApplyModifiersStep(Step):
             has_mirror = False
 
             try:
-                for i, mod in enumerate(object.modifiers):
-                    if type(mod) is bpy.types.MirrorModifier:
-                        has_mirror = True
-                        break
+                has_mirror = self.has_mirror(object)
 
                 if object.data.name in self.shared.encountered_data and not has_mirror:
                     object.data = self.shared.encountered_data[object.data.name]
@@ -144,7 +174,67 @@ class ApplyModifiersStep(Step):
             except:
                 raise
 
-        return self
+    def apply_evaluated(self):
+        targets = []
+        names = set()
 
-    def __exit__(self, *args):
-        pass
+        for object in self.objects:
+            if object.type != "MESH":
+                continue
+
+            try:
+                name = object.data.name
+
+                if name in self.shared.encountered_data and not self.has_mirror(object):
+                    object.data = self.shared.encountered_data[name]
+                    continue
+
+                if name in names and not self.has_mirror(object):
+                    targets.append((object, name, False))
+                    continue
+
+                names.add(name)
+                targets.append((object, name, True))
+            except ReferenceError:
+                pass
+            except:
+                raise
+
+        disabled = []
+
+        for object, name, evaluate in targets:
+            if not evaluate:
+                continue
+
+            for mod in object.modifiers:
+                if type(mod) is bpy.types.ArmatureModifier and mod.show_viewport:
+                    mod.show_viewport = False
+                    disabled.append(mod)
+
+        depsgraph = self.context.evaluated_depsgraph_get()
+        meshes = {}
+
+        for object, name, evaluate in targets:
+            if not evaluate:
+                continue
+
+            evaluated = object.evaluated_get(depsgraph)
+            meshes[object] = bpy.data.meshes.new_from_object(
+                evaluated, preserve_all_data_layers=True, depsgraph=depsgraph)
+
+        for mod in disabled:
+            mod.show_viewport = True
+
+        for object, name, evaluate in targets:
+            if not evaluate:
+                object.data = self.shared.encountered_data[name]
+                continue
+
+            object.data = meshes[object]
+            self.shared.encountered_data[name] = object.data
+
+            for mod in reversed(list(object.modifiers)):
+                if type(mod) is bpy.types.ArmatureModifier:
+                    continue
+
+                object.modifiers.remove(mod)
@@ -5,58 +5,66 @@
 # See the LICENSE file in the top-level directory for details.
 
 import bmesh
-from mathutils import Matrix, Vector
+import numpy
 
 from .step import Step
 
 uv_name = "Outline"
 
 
+def read_vectors(collection, attribute, count, size=3):
+    buffer = numpy.empty(count * size, numpy.float32)
+    collection.foreach_get(attribute, buffer)
+
+    return buffer.reshape(-1, size)
+
+
 def outline_normals(obj):
-    meshd = obj.data.copy()
-    meshs = obj.data.copy()
+    mesh = obj.data
 
-    if uv_name not in obj.data.uv_layers:
-        obj.data.uv_layers.new(name=uv_name)
+    if mesh.uv_layers.active == None:
+        return
 
-    bm = bmesh.new()
-    bm.from_mesh(meshd)
-    bm.to_mesh(meshd)
-    bm.free()
+    active_name = mesh.uv_layers.active.name
 
-    bm = bmesh.new()
-    bm.from_mesh(meshs)
+    if uv_name not in mesh.uv_layers:
+        mesh.uv_layers.new(name=uv_name)
 
-    for f in bm.edges:
-        f.smooth = True
+    mesh.calc_tangents(uvmap=active_name)
 
-    for f in bm.faces:
-        f.smooth = True
+    loop_count = len(mesh.loops)
 
-    bm.to_mesh(meshs)
-    bm.free()
+    normals = read_vectors(mesh.corner_normals, "vector", loop_count)
+    tangents = read_vectors(mesh.loops, "tangent", loop_count)
+    bitangents = read_vectors(mesh.loops, "bitangent", loop_count)
+    signs = read_vectors(mesh.loops, "bitangent_sign", loop_count, 1)[:, 0]
 
-    active_name = meshd.uv_layers.active.name
+    vertex_indices = numpy.empty(loop_count, numpy.int32)
+    mesh.loops.foreach_get("vertex_index", vertex_indices)
 
-    meshd.calc_tangents(uvmap=active_name)
-    meshs.calc_tangents(uvmap=active_name)
+    vertex_normals = read_vectors(
+        mesh.vertex_normals, "vector", len(mesh.vertices))
+    smooth_normals = vertex_normals[vertex_indices]
 
-    uv_layer = obj.data.uv_layers[uv_name].data
+    mesh.free_tangents()
 
-    for i in range(0, len(meshd.loops)):
-        loopd = meshd.loops[i]
-        loops = meshs.loops[i]
+    # Solve [t b n] @ c = s per loop through the adjugate of the TBN matrix.
+    rows = numpy.stack((
+        numpy.cross(bitangents, normals),
+        numpy.cross(normals, tangents),
+        numpy.cross(tangents, bitangents),
+    ), axis=1)
+    determinants = numpy.einsum("ij,ij->i", tangents, rows[:, 0])
+    determinants[determinants == 0.00] = numpy.inf
 
-        nd = loopd.normal
-        td = loopd.tangent
-        bd = loopd.bitangent
-        ns = loops.normal
+    corrected = numpy.einsum("ijk,ik->ij", rows, smooth_normals)
+    corrected /= determinants[:, None]
 
-        tbnd = Matrix((td, bd, nd)).transposed().inverted()
-        corrected_normal = tbnd @ ns
+    uvs = numpy.empty((loop_count, 2), numpy.float32)
+    uvs[:, 0] = corrected[:, 0]
+    uvs[:, 1] = -corrected[:, 1] * signs
 
-        uv_layer[loopd.index].uv = Vector(
-            (corrected_normal.x, -corrected_normal.y * loopd.bitangent_sign))
+    mesh.uv_layers[uv_name].data.foreach_set("uv", uvs.ravel())
 
 
 class OutlineCorrectionStep(Step):
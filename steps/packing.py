@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import bpy
+import numpy
+
+from .atlas import is_encoded, target_image
+from .textures import channel_size, read_pixels, write_pixels, srgb_to_linear
+
+components = ["red", "green", "blue", "alpha"]
+
+
+def layout(settings):
+    return [getattr(settings.channel_packing_layout, component).lower() for component in components]
+
+
+def packed_channels(settings):
+    # The packed texture only exists to be saved, without Save Textures the channels stay separate.
+    if not settings.channel_packing or not settings.save_textures:
+        return []
+
+    return [channel for channel in layout(settings)
+            if channel != "none" and getattr(settings.texture_toggles, channel + "_toggle")]
+
+
+def packed_size(settings, size):
+    return max(channel_size(settings.texture_toggles, channel, size) for channel in packed_channels(settings))
+
+
+def resample(pixels, size):
+    height, width = pixels.shape[:2]
+    ys = numpy.arange(0, size) * height // size
+    xs = numpy.arange(0, size) * width // size
+
+    return pixels[ys][:, xs]
+
+
+def pack(prefix, settings, size):
+    channels = packed_channels(settings)
+
+    if len(channels) == 0:
+        return None
+
+    size = packed_size(settings, size)
+    packed = numpy.zeros((size, size, 4), numpy.float32)
+    packed[:, :, 3] = 1.00
+
+    for i, channel in enumerate(layout(settings)):
+        if channel not in channels:
+            continue
+
+        source = bpy.data.images.get(prefix + "." + channel)
+
+        if source == None or not source.has_data:
+            continue
+
+        pixels = read_pixels(source)
+
+        if is_encoded(source):
+            pixels = srgb_to_linear(pixels)
+
+        packed[:, :, i] = resample(pixels[:, :, 0], size)
+
+    image = target_image(prefix + ".packed", size)
+    image.colorspace_settings.name = 'Non-Color'
+    image.alpha_mode = 'CHANNEL_PACKED'
+
+    write_pixels(image, packed)
+    image.update()
+
+    return image
@@ -30,24 +30,32 @@ class ObjectModeStep(Step):
 
 
 class UnhideStep(Step):
+    holds_result = True
+
     def __init__(self, previous):
         super().__init__(previous)
         self.visibilities = []
+        self.layer_collection = None
         self.collection_was_visible = False
 
     def __enter__(self):
         layer_collection = self.context.view_layer.layer_collection
-        layer_collection_collection = self.find_layer_collection(
+        self.layer_collection = self.find_layer_collection(
             layer_collection, self.collection.name
         )
 
-        self.collection_was_visible = layer_collection_collection.hide_viewport
-        layer_collection_collection.hide_viewport = False
+        if self.layer_collection != None:
+            self.collection_was_visible = self.layer_collection.hide_viewport
+            self.layer_collection.hide_viewport = False
 
         for object in self.objects:
-            self.visibilities.append(
-                (object, object.hide_get(), object.hide_viewport, object.hide_render)
-            )
+            visibility = (object, object.hide_get(),
+                          object.hide_viewport, object.hide_render)
+
+            if not any(visibility[1:]):
+                continue
+
+            self.visibilities.append(visibility)
 
             object.hide_set(False)
             object.hide_viewport = False
@@ -56,10 +64,8 @@ class UnhideStep(Step):
         return self
 
     def __exit__(self, *args):
-        layer_collection = self.context.view_layer.layer_collection
-        self.find_layer_collection(
-            layer_collection, self.collection.name
-        ).hide_viewport = self.collection_was_visible
+        if self.layer_collection != None:
+            self.layer_collection.hide_viewport = self.collection_was_visible
 
         for visibility in self.visibilities:
             visibility[0].hide_set(visibility[1])
@@ -76,3 +82,57 @@ class UnhideStep(Step):
                 return found
 
         return None
+
+
+class ScratchSceneStep(Step):
+    scene_name = ".merge_export.scene"
+
+    def __init__(self, previous, objects):
+        super().__init__(previous)
+        self.linked = objects
+        self.scene = None
+        self.override = None
+
+    def __enter__(self):
+        self.scene = self.context.scene.copy()
+        self.scene.name = self.scene_name
+
+        for child in list(self.scene.collection.children):
+            self.scene.collection.children.unlink(child)
+
+        for object in list(self.scene.collection.objects):
+            self.scene.collection.objects.unlink(object)
+
+        for view_layer in list(self.scene.view_layers)[1:]:
+            self.scene.view_layers.remove(view_layer)
+
+        self.link(self.linked)
+
+        self.override = self.context.temp_override(
+            scene=self.scene, view_layer=self.scene.view_layers[0])
+        self.override.__enter__()
+
+        return self
+
+    def __exit__(self, *args):
+        if self.override != None:
+            self.override.__exit__(*args)
+
+        if self.scene != None:
+            bpy.data.scenes.remove(self.scene)
+
+    def link(self, objects):
+        linked = []
+
+        for object in objects:
+            if self.scene.collection.objects.get(object.name) == object:
+                continue
+
+            self.scene.collection.objects.link(object)
+            linked.append(object)
+
+        return linked
+
+    def unlink(self, objects):
+        for object in objects:
+            self.scene.collection.objects.unlink(object)
@@ -4,6 +4,8 @@
 # Licensed under the GNU General Public License v3.0 or later
 # See the LICENSE file in the top-level directory for details.
 
+import time
+
 import bpy
 
 from .step import Step
@@ -29,6 +31,7 @@ class PreserveSelectionsStep(Step):
 
 
 class RenameStep(Step):
+    holds_result = True
     prefix = ".copy.:."
     postfix = ".#."
 
@@ -50,6 +53,8 @@ class RenameStep(Step):
 
 
 class UnrenameStep(Step):
+    holds_result = True
+
     def __init__(self, previous):
         super().__init__(previous)
         self.previous_names = []
@@ -67,16 +72,44 @@ class UnrenameStep(Step):
 
 
 class DuplicateStep(Step):
+    holds_result = True
+    scratch_name = ".merge_export.duplicates"
+
+    def __init__(self, previous):
+        super().__init__(previous)
+        self.scratch = None
+
     def __enter__(self):
         props = self.collection.merge_exporter_props
+        mode = self.context.scene.merge_exporter_settings.duplicate_mode
 
         if not props.export_origin:
-            self.select(lambda object: object.type ==
-                        "MESH" and object != props.origin)
+            objects = [object for object in self.objects if object.type ==
+                       "MESH" and object != props.origin]
         else:
-            self.select(lambda object: object.type == "MESH")
+            objects = [object for object in self.objects if object.type == "MESH"]
+
+        start = time.perf_counter()
+
+        if mode == "DATA":
+            duplicated = self.duplicate_data(objects)
+        else:
+            duplicated = self.duplicate_operator(objects)
+
+        self.select(None, duplicated)
+        self.select_add(lambda object: object.type != "MESH")
+
+        self.objects_forward = self.gather()
+        self.shared.add_timing("duplicate." + mode,
+                               time.perf_counter() - start)
+
+        return self
+
+    def __exit__(self, *args):
+        if self.scratch != None:
+            bpy.data.collections.remove(self.scratch)
 
-        objects = self.gather()
+    def duplicate_operator(self, objects):
         duplicated = []
 
         for object in objects:
@@ -87,12 +120,23 @@ class DuplicateStep(Step):
             duplicated.append(object_dup)
             self.duplicated_sources.append((object_dup, object))
 
-        self.select(None, duplicated)
-        self.select_add(lambda object: object.type != "MESH")
+        return duplicated
 
-        self.objects_forward = self.gather()
+    def duplicate_data(self, objects):
+        self.scratch = bpy.data.collections.new(self.scratch_name)
+        self.context.scene.collection.children.link(self.scratch)
 
-        return self
+        duplicated = []
 
-    def __exit__(self, *args):
-        pass
+        for object in objects:
+            object_dup = object.copy()
+
+            if object.data:
+                object_dup.data = object.data.copy()
+
+            self.scratch.objects.link(object_dup)
+            duplicated.append(object_dup)
+
+        self.duplicated_sources.extend(zip(duplicated, objects))
+
+        return duplicated
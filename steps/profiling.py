@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import json
+import os
+import time
+import tracemalloc
+
+import bpy
+import numpy
+
+datablocks = ["objects", "meshes", "materials", "images", "collections"]
+
+
+def count_geometry(objects):
+    counts = {"objects": 0, "vertices": 0, "triangles": 0}
+
+    for object in objects:
+        try:
+            if object.type != "MESH":
+                counts["objects"] += 1
+                continue
+
+            mesh = object.data
+            loop_totals = numpy.empty(len(mesh.polygons), numpy.int32)
+            mesh.polygons.foreach_get("loop_total", loop_totals)
+
+            counts["objects"] += 1
+            counts["vertices"] += len(mesh.vertices)
+            counts["triangles"] += int(numpy.sum(loop_totals - 2))
+        except ReferenceError:
+            pass
+
+    return counts
+
+
+def count_datablocks():
+    return {name: len(getattr(bpy.data, name)) for name in datablocks}
+
+
+class ProfiledStep:
+    def __init__(self, profiler, step):
+        self.profiler = profiler
+        self.step = step
+
+    def __enter__(self):
+        begin = self.profiler.begin()
+        result = self.step.__enter__()
+        self.profiler.end(self.step, "enter", begin, result)
+
+        return result
+
+    def __exit__(self, *args):
+        begin = self.profiler.begin()
+        result = self.step.__exit__(*args)
+        self.profiler.end(self.step, "exit", begin, None)
+
+        return result
+
+
+class Profiler:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.events = []
+        self.totals = {}
+        self.origin = time.perf_counter()
+        self.started_tracing = False
+
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def wrap(self, step):
+        if not self.enabled:
+            return step
+
+        return ProfiledStep(self, step)
+
+    def begin(self):
+        return (time.perf_counter(), tracemalloc.get_traced_memory()[0], count_datablocks())
+
+    def end(self, step, phase, begin, result):
+        seconds = time.perf_counter() - begin[0]
+        name = type(step).__name__
+        datablocks_after = count_datablocks()
+
+        args = {
+            "collection": step.collection.name if step.collection != None else None,
+            "allocated": tracemalloc.get_traced_memory()[0] - begin[1],
+            "datablocks": {name: datablocks_after[name] - begin[2][name] for name in datablocks},
+        }
+
+        if result != None and hasattr(result, "objects_forward"):
+            args.update(count_geometry(result.objects_forward))
+
+        self.events.append({
+            "name": name + "." + phase,
+            "cat": phase,
+            "ph": "X",
+            "ts": (begin[0] - self.origin) * 1000000.00,
+            "dur": seconds * 1000000.00,
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": args,
+        })
+
+        total = self.totals.setdefault(name, {"enter": 0.00, "exit": 0.00})
+        total[phase] += seconds
+
+    def write(self, path):
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.events,
+                      "displayTimeUnit": "ms"}, file)
+
+    def close(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import numpy
+
+from .merging import read
+
+chunk_pixels = 1 << 20
+
+
+def read_triangles(mesh):
+    count = len(mesh.loop_triangles)
+
+    loops = read(mesh.loop_triangles, "loops", count, 3, numpy.int32)
+    materials = read(mesh.loop_triangles, "material_index",
+                     count, 1, numpy.int32)
+    uvs = read(mesh.uv_layers.active.data, "uv",
+               len(mesh.loops), 2, numpy.float32)
+
+    return uvs[loops], materials
+
+
+def rasterize_chunk(indices, corners, materials, size):
+    low = numpy.clip(numpy.floor(corners.min(axis=1) - 0.50), 0, size - 1).astype(numpy.int64)
+    high = numpy.clip(numpy.ceil(corners.max(axis=1) - 0.50), 0, size - 1).astype(numpy.int64)
+    extents = high - low + 1
+    counts = extents[:, 0] * extents[:, 1]
+
+    triangle = numpy.repeat(numpy.arange(0, len(corners)), counts)
+    offsets = numpy.arange(0, counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+
+    x = low[triangle, 0] + offsets % extents[triangle, 0]
+    y = low[triangle, 1] + offsets // extents[triangle, 0]
+    points = numpy.stack([x, y], axis=1) + 0.50
+
+    a = corners[triangle, 0]
+    b = corners[triangle, 1]
+    c = corners[triangle, 2]
+
+    def edge(p, q, r):
+        return (q[:, 0] - p[:, 0]) * (r[:, 1] - p[:, 1]) - (q[:, 1] - p[:, 1]) * (r[:, 0] - p[:, 0])
+
+    w0 = edge(b, c, points)
+    w1 = edge(c, a, points)
+    w2 = edge(a, b, points)
+
+    inside = ((w0 >= 0) & (w1 >= 0) & (w2 >= 0)) | (
+        (w0 <= 0) & (w1 <= 0) & (w2 <= 0))
+    inside &= edge(a, b, c) != 0
+
+    indices[y[inside], x[inside]] = materials[triangle[inside]]
+
+
+def dilate(indices, margin):
+    for i in range(0, margin):
+        for source, destination in [
+            (indices[:, :-1], indices[:, 1:]),
+            (indices[:, 1:], indices[:, :-1]),
+            (indices[:-1, :], indices[1:, :]),
+            (indices[1:, :], indices[:-1, :]),
+        ]:
+            destination[...] = numpy.where(
+                (destination < 0) & (source >= 0), source, destination)
+
+
+def material_mask(meshes, size, divisor, margin):
+    indices = numpy.full((size, size), -1, numpy.int32)
+
+    for mesh in meshes:
+        if mesh.uv_layers.active == None:
+            continue
+
+        uvs, materials = read_triangles(mesh)
+        corners = uvs * size
+        extents = numpy.ceil(corners.max(axis=1) - corners.min(axis=1)) + 1
+        pixels = numpy.cumsum(extents[:, 0] * extents[:, 1])
+
+        start = 0
+
+        while start < len(corners):
+            done = pixels[start - 1] if start > 0 else 0
+            end = max(int(numpy.searchsorted(
+                pixels, done + chunk_pixels, side="right")), start + 1)
+            rasterize_chunk(indices, corners[start:end],
+                            materials[start:end], size)
+            start = end
+
+    dilate(indices, margin)
+
+    values = numpy.clip(indices / max(divisor, 1), 0.00, 1.00)
+    mask = numpy.zeros((size, size, 4), numpy.float32)
+    mask[:, :, 0] = numpy.where(indices >= 0, values, 0.00)
+    mask[:, :, 3] = 1.00
+
+    return mask
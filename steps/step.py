@@ -4,16 +4,43 @@
 # Licensed under the GNU General Public License v3.0 or later
 # See the LICENSE file in the top-level directory for details.
 
+import os
+
 import bpy
 
 
+def output_path(collection, extension):
+    props = collection.merge_exporter_props
+    name = collection.name
+
+    if props.override_name:
+        name = props.name
+
+    return os.path.abspath(bpy.path.abspath(props.path)) + "/" + name + extension
+
+
 class StepShared:
     def __init__(self):
         self.encountered_data = {}
         self.encountered_materials = {}
+        self.timings = {}
+        self.exported = []
+        self.skipped = []
+        self.texture_writer = None
+        self.memory_peaks = {}
+        self.export_sizes = {}
+        self.missing_profiles = []
+        self.atlased = set()
+        self.baked = set()
+        self.profiler = None
+
+    def add_timing(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.00) + seconds
 
 
 class Step:
+    holds_result = False
+
     def __init__(self, previous):
         self.objects = []
         self.objects_forward = []
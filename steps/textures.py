@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import concurrent.futures
+import os
+import struct
+import threading
+import zlib
+
+import bpy
+import numpy
+
+png_signature = b"\x89PNG\r\n\x1a\n"
+
+
+def read_pixels(image):
+    width, height = image.size
+    pixels = numpy.empty(width * height * 4, numpy.float32)
+    image.pixels.foreach_get(pixels)
+
+    return pixels.reshape(height, width, 4)
+
+
+def write_pixels(image, pixels):
+    image.pixels.foreach_set(pixels.astype(numpy.float32, copy=False).ravel())
+
+
+def quantize(pixels, depth):
+    scale = 255.00 if depth == 8 else 65535.00
+    dtype = numpy.uint8 if depth == 8 else numpy.uint16
+
+    return numpy.rint(numpy.clip(pixels, 0.00, 1.00) * scale).astype(dtype)
+
+
+def dequantize(pixels):
+    scale = 255.00 if pixels.dtype == numpy.uint8 else 65535.00
+
+    return pixels.astype(numpy.float32) / scale
+
+
+def png_chunk(kind, data):
+    chunk = kind + data
+
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk) & 0xFFFFFFFF)
+
+
+def encode_png(pixels, level=6):
+    height, width, channels = pixels.shape
+    depth = 8 if pixels.dtype == numpy.uint8 else 16
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+
+    rows = pixels[::-1].astype(">u2" if depth == 16 else numpy.uint8)
+    rows = rows.reshape(height, -1).view(numpy.uint8)
+
+    raw = numpy.zeros((height, rows.shape[1] + 1), numpy.uint8)
+    raw[:, 1:] = rows
+
+    header = struct.pack(">IIBBBBB", width, height,
+                         depth, color_type, 0, 0, 0)
+
+    return (png_signature
+            + png_chunk(b"IHDR", header)
+            + png_chunk(b"IDAT", zlib.compress(raw.tobytes(), level))
+            + png_chunk(b"IEND", b""))
+
+
+def decode_png(data):
+    # Only reads what encode_png writes: one IDAT chunk, no filtering.
+    position = len(png_signature)
+    header = None
+    compressed = b""
+
+    while position < len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        chunk = data[position + 8:position + 8 + length]
+        position += length + 12
+
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"IDAT":
+            compressed += chunk
+
+    width, height, depth, color_type = header[:4]
+    channels = {0: 1, 4: 2, 2: 3, 6: 4}[color_type]
+    dtype = numpy.uint8 if depth == 8 else numpy.dtype(">u2")
+
+    raw = numpy.frombuffer(zlib.decompress(compressed), numpy.uint8)
+    rows = raw.reshape(height, -1)[:, 1:].copy()
+    pixels = rows.view(dtype).reshape(height, width, channels)
+
+    return pixels[::-1].astype(numpy.uint8 if depth == 8 else numpy.uint16)
+
+
+def encode_tga(pixels):
+    height, width, channels = pixels.shape
+    header = struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0,
+                         0, 0, width, height, 32, 8)
+    bgra = pixels[:, :, [2, 1, 0, 3]]
+
+    return header + numpy.ascontiguousarray(bgra).tobytes()
+
+
+def linear_to_srgb(pixels):
+    rgb = numpy.clip(pixels[:, :, :3], 0.00, 1.00)
+    pixels[:, :, :3] = numpy.where(
+        rgb <= 0.0031308, rgb * 12.92, 1.055 * numpy.power(rgb, 1.00 / 2.40) - 0.055)
+
+    return pixels
+
+
+def srgb_to_linear(pixels):
+    rgb = numpy.clip(pixels[:, :, :3], 0.00, 1.00)
+    pixels[:, :, :3] = numpy.where(
+        rgb <= 0.04045, rgb / 12.92, numpy.power((rgb + 0.055) / 1.055, 2.40))
+
+    return pixels
+
+
+def write_file(destination, data):
+    # Parallel export workers may write the same destination, each through its own temporary file.
+    temporary = "%s.%d.%d.tmp" % (destination, os.getpid(), threading.get_ident())
+
+    with open(temporary, "wb") as file:
+        file.write(data)
+
+    os.replace(temporary, destination)
+
+
+def encode_file(destination, pixels, format):
+    if format == ".tga":
+        write_file(destination, encode_tga(pixels))
+    else:
+        write_file(destination, encode_png(pixels))
+
+
+def save_datablock(image, destination):
+    copy = image.copy()
+    copy.scale(image.size[0], image.size[1])
+
+    tmp_buf = numpy.empty(
+        image.size[0] * image.size[1] * 4, numpy.float32)
+    image.pixels.foreach_get(tmp_buf)
+    copy.pixels.foreach_set(tmp_buf)
+
+    copy.save(filepath=destination)
+    bpy.data.images.remove(copy)
+
+
+def channel_size(texture_toggles, channel, size):
+    mode = getattr(texture_toggles, channel + "_resolution")
+
+    if mode == 'ABSOLUTE':
+        return getattr(texture_toggles, channel + "_size")
+
+    return max(1, size // int(mode))
+
+
+def image_bytes(image):
+    return image.size[0] * image.size[1] * (16 if image.is_float else 4)
+
+
+class TextureWriter:
+    def __init__(self, workers=None, budget=None):
+        if workers == None:
+            workers = min(4, os.cpu_count() or 1)
+
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.pending = []
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.live = {}
+        self.pending_bytes = 0
+        self.peak_bytes = 0
+
+    def track(self, image):
+        self.live[image.name] = image_bytes(image)
+        self.update_peak(0)
+
+    def untrack(self, name):
+        self.live.pop(name, None)
+
+    def update_peak(self, transient):
+        with self.lock:
+            used = sum(self.live.values()) + self.pending_bytes + transient
+
+        self.peak_bytes = max(self.peak_bytes, used)
+
+    def begin(self):
+        self.peak_bytes = 0
+        self.update_peak(0)
+
+    def release(self, size):
+        with self.lock:
+            self.pending_bytes -= size
+
+    def submit(self, image, destination):
+        format = os.path.splitext(destination)[1].lower()
+
+        if format not in (".png", ".tga"):
+            self.update_peak(image.size[0] * image.size[1] * 4 * 4 * 2)
+            save_datablock(image, destination)
+            return
+
+        depth = 16 if image.is_float and format == ".png" else 8
+        size = image.size[0] * image.size[1] * 4 * (depth // 8)
+        transient = image.size[0] * image.size[1] * 4 * 4
+
+        if self.budget != None:
+            used = sum(self.live.values()) + self.pending_bytes + transient + size
+
+            if used > self.budget:
+                self.wait()
+
+        self.update_peak(transient + size)
+
+        pixels = read_pixels(image)
+
+        if image.is_float and image.colorspace_settings.name != 'Non-Color':
+            pixels = linear_to_srgb(pixels)
+
+        pixels = quantize(pixels, depth)
+
+        with self.lock:
+            self.pending_bytes += size
+
+        future = self.pool.submit(encode_file, destination, pixels, format)
+        future.add_done_callback(lambda future: self.release(size))
+        self.pending.append(future)
+
+    def wait(self):
+        pending = self.pending
+        self.pending = []
+
+        for future in pending:
+            future.result()
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self.pool.shutdown()
+
+
+def create_writer(settings):
+    if settings.memory_budget:
+        return TextureWriter(budget=settings.memory_budget_size * 1024 * 1024)
+
+    return TextureWriter()
@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+# The add-on package only imports inside Blender. The tested modules touch bpy
+# only in the functions that talk to Blender, so they are loaded from the steps
+# directory on their own, and pytest is handed an empty module for the package.
+
+import os
+import sys
+import types
+
+package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def empty_package(name, path):
+    module = types.ModuleType(name)
+    module.__file__ = os.path.join(path, "__init__.py")
+    module.__path__ = [path]
+
+    return module
+
+
+sys.modules.setdefault("bpy", types.ModuleType("bpy"))
+sys.modules.setdefault(os.path.basename(package_path),
+                       empty_package(os.path.basename(package_path), package_path))
+sys.modules.setdefault("steps", empty_package(
+    "steps", os.path.join(package_path, "steps")))
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import numpy
+import pytest
+
+from steps import atlas
+
+
+def assert_disjoint(regions, size, gap):
+    for x, y, width, height in regions:
+        assert x >= gap and y >= gap
+        assert x + width + gap <= size and y + height + gap <= size
+
+    for i, a in enumerate(regions):
+        for b in regions[i + 1:]:
+            assert (a[0] + a[2] + gap * 2 <= b[0] or b[0] + b[2] + gap * 2 <= a[0]
+                    or a[1] + a[3] + gap * 2 <= b[1] or b[1] + b[3] + gap * 2 <= a[1])
+
+
+def test_shelf_places_regions_apart():
+    sizes = [(30, 20), (10, 40), (25, 25), (60, 5)]
+    regions = atlas.shelf(sizes, 128, 2)
+
+    assert [region[2:] for region in regions] == sizes
+    assert_disjoint(regions, 128, 2)
+
+
+def test_shelf_rejects_overflow():
+    assert atlas.shelf([(100, 100), (100, 100)], 128, 2) == None
+
+
+def test_pack_scales_down_to_fit():
+    regions = atlas.pack([(1024, 1024)] * 10, 512, 2)
+
+    assert len(regions) == 10
+    assert_disjoint(regions, 512, 2)
+
+
+@pytest.mark.parametrize("count, size, gap", [(1, 4, 2), (10, 64, 16), (300, 32, 1)])
+def test_pack_gives_up_when_nothing_fits(count, size, gap):
+    assert not atlas.grid_fits(count, size, gap)
+    assert atlas.pack([(64, 64)] * count, size, gap) == None
+
+
+@pytest.mark.parametrize("count, size, gap", [(1, 5, 2), (9, 15, 2), (16, 64, 5)])
+def test_pack_fits_what_grid_fits_accepts(count, size, gap):
+    sizes = [(int(width), int(height)) for width, height in
+             numpy.random.default_rng(count).integers(1, 256, (count, 2))]
+
+    assert atlas.grid_fits(count, size, gap)
+    assert_disjoint(atlas.pack(sizes, size, gap), size, gap)
+
+
+def test_region_gap_keeps_padding_and_stays_inside():
+    assert atlas.region_gap(1024, [1024, 1024]) == atlas.padding
+    assert atlas.region_gap(1024, [1024, 256]) == atlas.padding * 4
+    assert atlas.region_gap(2048, [1]) == 1024
+    assert atlas.region_gap(1024, []) == atlas.padding
+
+
+def test_widened_gap_without_room_terminates():
+    gap = atlas.region_gap(2048, [16])
+
+    assert not atlas.grid_fits(10, 2048, gap)
+    assert atlas.pack([(64, 64)] * 10, 2048, gap) == None
+
+
+def test_scale_region_and_paste_clip_to_the_atlas():
+    x, y, width, height = atlas.scale_region((4, 4, 8, 8), 0.50)
+    assert (x, y, width, height) == (2, 2, 4, 4)
+
+    target = numpy.zeros((6, 6, 4), numpy.float32)
+    block = numpy.ones((4 + atlas.padding * 2, 4 + atlas.padding * 2, 4), numpy.float32)
+    atlas.paste(target, block, x, y)
+
+    assert numpy.all(target[0:6, 0:6] == 1.00)
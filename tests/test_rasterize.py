@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import types
+
+import numpy
+
+from steps import rasterize
+
+
+class Collection:
+    def __init__(self, count, **attributes):
+        self.count = count
+        self.attributes = {name: numpy.asarray(value).ravel()
+                           for name, value in attributes.items()}
+
+    def __len__(self):
+        return self.count
+
+    def foreach_get(self, attribute, buffer):
+        buffer[:] = self.attributes[attribute]
+
+
+def mesh(uvs, materials):
+    layer = types.SimpleNamespace(data=Collection(len(uvs), uv=uvs))
+
+    return types.SimpleNamespace(
+        loops=Collection(len(uvs)),
+        uv_layers=types.SimpleNamespace(active=layer),
+        loop_triangles=Collection(len(materials), loops=numpy.arange(
+            0, len(uvs)), material_index=materials),
+    )
+
+
+def left_half_mesh():
+    # Two triangles covering u < 0.5, the second one wound clockwise.
+    uvs = [(0.00, 0.00), (0.50, 0.00), (0.50, 1.00),
+           (0.00, 0.00), (0.00, 1.00), (0.50, 1.00)]
+
+    return mesh(numpy.array(uvs, numpy.float32), [1, 2])
+
+
+def test_material_mask_covers_both_triangles():
+    mask = rasterize.material_mask([left_half_mesh()], 8, 2, 0)
+
+    assert mask.shape == (8, 8, 4)
+    assert numpy.all(numpy.isin(mask[:, :4, 0], [0.50, 1.00]))
+    assert numpy.any(mask[:, :4, 0] == 0.50)
+    assert numpy.any(mask[:, :4, 0] == 1.00)
+    assert numpy.all(mask[:, 4:, 0] == 0.00)
+    assert numpy.all(mask[:, :, 3] == 1.00)
+
+
+def test_material_mask_dilates_by_margin():
+    mask = rasterize.material_mask([left_half_mesh()], 8, 2, 2)
+
+    assert numpy.all(mask[:, :6, 0] > 0.00)
+    assert numpy.all(mask[:, 6:, 0] == 0.00)
+
+
+def test_dilate_leaves_covered_pixels():
+    indices = numpy.full((5, 5), -1, numpy.int32)
+    indices[2, 2] = 3
+    indices[0, 0] = 1
+
+    rasterize.dilate(indices, 1)
+
+    assert indices[2, 2] == 3
+    assert indices[0, 0] == 1
+    assert indices[1, 2] == 3 and indices[2, 1] == 3
+    assert indices[4, 4] == -1
@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright(c) 2025 Arlirad
+# Licensed under the GNU General Public License v3.0 or later
+# See the LICENSE file in the top-level directory for details.
+
+import struct
+import zlib
+
+import numpy
+import pytest
+
+from steps import textures
+
+
+@pytest.mark.parametrize("dtype", [numpy.uint8, numpy.uint16])
+@pytest.mark.parametrize("channels", [1, 2, 3, 4])
+def test_png_round_trip(dtype, channels):
+    maximum = numpy.iinfo(dtype).max
+    pixels = numpy.random.default_rng(channels).integers(
+        0, maximum + 1, (3, 5, channels), dtype=dtype)
+
+    decoded = textures.decode_png(textures.encode_png(pixels))
+
+    assert decoded.dtype == dtype
+    assert numpy.array_equal(decoded, pixels)
+
+
+def test_png_header():
+    data = textures.encode_png(numpy.zeros((2, 7, 4), numpy.uint16))
+
+    assert data.startswith(textures.png_signature)
+    assert struct.unpack(">IIBB", data[16:26]) == (7, 2, 16, 6)
+
+
+def test_quantize_round_trip():
+    pixels = numpy.linspace(0.00, 1.00, 256, dtype=numpy.float32).reshape(1, 64, 4)
+
+    assert numpy.allclose(textures.dequantize(
+        textures.quantize(pixels, 8)), pixels, atol=0.5 / 255.00)
+    assert numpy.allclose(textures.dequantize(
+        textures.quantize(pixels, 16)), pixels, atol=0.5 / 65535.00)
+
+
+@pytest.mark.parametrize("length", [10, 40, 70])
+def test_truncated_png_raises(length):
+    data = textures.encode_png(numpy.zeros((16, 16, 4), numpy.uint8))
+
+    with pytest.raises((zlib.error, struct.error, ValueError, TypeError)):
+        textures.decode_png(data[:length])
+
+
+def test_srgb_conversion_round_trip():
+    pixels = numpy.random.default_rng(0).random((4, 4, 4), numpy.float32)
+    alpha = pixels[:, :, 3].copy()
+
+    converted = textures.srgb_to_linear(textures.linear_to_srgb(pixels.copy()))
+
+    assert numpy.allclose(converted, pixels, atol=1e-5)
+    assert numpy.array_equal(converted[:, :, 3], alpha)